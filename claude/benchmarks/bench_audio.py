@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the per-clip audio path (no TTS calls, no credentials).
+
+Renders synthetic speech-length clips through the same helpers create_audio
+uses, once as MP3 (the default TTS_ENCODING) and once as PCM (LINEAR16 WAV),
+and reports CPU time per clip — including the ffmpeg child processes that
+do the post-slowdown, MP3 decode and final AAC encode.
+
+Usage (from the claude/ directory):
+    uv run python benchmarks/bench_audio.py          # 20 clips per path
+    uv run python benchmarks/bench_audio.py 50       # 50 clips per path
+"""
+
+import io
+import os
+import sys
+import math
+import time
+import wave
+import array
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import german_tts_generator as gtg  # noqa: E402
+
+SAMPLE_RATE = 24000  # what Chirp3-HD voices return
+CLIP_SECONDS = 3.0
+
+
+def synthetic_wav(seconds=CLIP_SECONDS, seed=0):
+    """A speech-length 16-bit mono WAV: a gliding tone with a syllable-like envelope."""
+    n = int(seconds * SAMPLE_RATE)
+    samples = array.array("h", (
+        int(12000 * math.sin(2 * math.pi * (180 + 40 * math.sin(t / 2400 + seed)) * t / SAMPLE_RATE)
+            * abs(math.sin(math.pi * t / 4800)))
+        for t in range(n)))
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+def to_mp3(wav_bytes):
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+         "-f", "mp3", "pipe:1"],
+        input=wav_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return result.stdout
+
+
+def cpu_seconds():
+    """CPU time of this process plus all reaped children (ffmpeg)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def run_path(german, english, clips, tempo):
+    """Render `clips` clips from the given synthesized bytes; return (cpu, wall) per clip."""
+    cpu0, wall0 = cpu_seconds(), time.perf_counter()
+    for _ in range(clips):
+        de = gtg._slow_audio(german, tempo)
+        en = gtg._slow_audio(english, tempo)
+        combined = gtg._mix_clip(de, en)
+        combined.export(io.BytesIO(), format="ipod", codec="aac", bitrate="128k")
+    return ((cpu_seconds() - cpu0) / clips, (time.perf_counter() - wall0) / clips)
+
+
+def main():
+    clips = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    tempo = gtg.SPEAKING_RATE
+    german_wav, english_wav = synthetic_wav(seed=0), synthetic_wav(seed=1)
+    print(f"{clips} clips per path, {CLIP_SECONDS:.0f}s per language, "
+          f"post-slowdown atempo={tempo}\n")
+
+    results = {"pcm": run_path(german_wav, english_wav, clips, tempo)}
+    try:
+        german_mp3, english_mp3 = to_mp3(german_wav), to_mp3(english_wav)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"⚠ Can't encode MP3 test input with this ffmpeg ({e}); "
+              "showing the PCM path only")
+    else:
+        results["mp3"] = run_path(german_mp3, english_mp3, clips, tempo)
+
+    for name, (cpu, wall) in results.items():
+        print(f"{name:>4}: {cpu * 1000:7.1f} ms CPU/clip  {wall * 1000:7.1f} ms wall/clip")
+    if "mp3" in results:
+        saved = results["mp3"][0] - results["pcm"][0]
+        print(f"\nPCM saves {saved * 1000:.1f} ms CPU per clip "
+              f"({saved / results['mp3'][0]:.0%})")
+
+
+if __name__ == "__main__":
+    main()
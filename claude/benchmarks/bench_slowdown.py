@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the post-processing slowdown backends (no TTS calls).
+
+Slows the same synthetic PCM clip repeatedly with each SLOWDOWN_BACKEND and
+reports clips/sec, so the per-clip ffmpeg process startup can be compared with
+the in-process WSOLA time-stretch.
+
+Usage (from the claude/ directory):
+    uv run python benchmarks/bench_slowdown.py          # 50 clips per backend
+    uv run python benchmarks/bench_slowdown.py 200
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import german_tts_generator as gtg  # noqa: E402
+from bench_audio import synthetic_wav  # noqa: E402
+
+BACKENDS = ("ffmpeg", "wsola")
+
+
+def main():
+    clips = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    tempo = gtg.SPEAKING_RATE
+    clip = synthetic_wav()  # WSOLA works on PCM; give both backends the same input
+    print(f"{clips} clips per backend, atempo={tempo}\n")
+
+    for backend in BACKENDS:
+        started = time.perf_counter()
+        for _ in range(clips):
+            slowed = gtg._slow_audio(clip, tempo, backend)
+        elapsed = time.perf_counter() - started
+        if slowed is clip:
+            print(f"{backend:>7}: unavailable (slowdown returned the input unchanged)")
+            continue
+        print(f"{backend:>7}: {clips / elapsed:8.1f} clips/sec  "
+              f"({elapsed / clips * 1000:.1f} ms/clip)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Startup-time budget check for german_tts_generator (no API calls).
+
+Imports the module in a fresh interpreter under `-X importtime` and reports its
+cumulative import time, times `--help` end to end, and checks that the heavy
+SDKs (Google TTS, pydub, anthropic) were not pulled in by the import. Exits
+non-zero if any check fails, so a startup regression is caught.
+
+Usage (from the claude/ directory):
+    uv run python benchmarks/bench_startup.py          # 150 ms import budget
+    uv run python benchmarks/bench_startup.py 80       # custom budget in ms
+"""
+
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULE = "german_tts_generator"
+HEAVY_MODULES = ("google.cloud.texttospeech", "pydub", "anthropic")
+RUNS = 5
+
+
+def import_time_us():
+    """Cumulative import time of MODULE in microseconds, per -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        match = re.match(r"import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S+)$", line)
+        if match and match.group(2) == MODULE:
+            return int(match.group(1))
+    raise RuntimeError(f"{MODULE} missing from -X importtime output")
+
+
+def help_seconds():
+    started = time.perf_counter()
+    subprocess.run([sys.executable, f"{MODULE}.py", "--help"], cwd=ROOT,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - started
+
+
+def heavy_imports():
+    """Heavy SDK modules present in sys.modules after importing MODULE."""
+    probe = (f"import sys, {MODULE}; "
+             f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 150.0
+    failed = False
+
+    import_ms = min(import_time_us() for _ in range(RUNS)) / 1000
+    ok = import_ms <= budget_ms
+    failed |= not ok
+    print(f"{'✓' if ok else '✗'} import {MODULE}: {import_ms:.1f} ms "
+          f"(budget {budget_ms:.0f} ms, best of {RUNS})")
+
+    help_ms = min(help_seconds() for _ in range(RUNS)) * 1000
+    print(f"✓ --help end to end: {help_ms:.1f} ms (incl. interpreter startup)")
+
+    loaded = heavy_imports()
+    if loaded:
+        failed = True
+        print(f"✗ imported eagerly: {', '.join(loaded)}")
+    else:
+        print(f"✓ no heavy SDKs imported ({', '.join(HEAVY_MODULES)})")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
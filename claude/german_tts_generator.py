@@ -16,19 +16,34 @@ Setup:
 Usage:
     python german_audio.py generate "give me sentences using dative case"
     python german_audio.py generate "everyday greetings" A1   # constrain to a CEFR level
+    python german_audio.py generate "everyday greetings" --no-cache  # ignore cached replies
     python german_audio.py import-wordlist                    # import all Goethe A1-B1 words
     python german_audio.py import-wordlist A1                 # import just one level
     python german_audio.py import-wordlist A1 100             # 100 most common A1 words
     python german_audio.py generate-words A1 20               # FRESH sentences for top 20 A1 words
     python german_audio.py generate-words B1 "Umwelt, Vertrag, sich beeilen"
+    python german_audio.py generate-words B1 500 --batch      # via Message Batches (rerun to resume)
+    python german_audio.py generate-words --batch             # resume a pending Message Batch
+    python german_audio.py generate-words A1 50 --stream --audio  # save + voice entries as they arrive
+    python german_audio.py pipeline A1 200                    # import + voice, most frequent first
+    python german_audio.py pipeline B1 50 --source claude     # stream fresh sentences into audio
     python german_audio.py list
     python german_audio.py list A1                            # list one level
     python german_audio.py list A1 20                         # top 20 A1 by frequency
     python german_audio.py create-audio "the_dog_is_big"
     python german_audio.py create-all
     python german_audio.py create-all A1                      # only A1-tagged sentences
+    python german_audio.py create-all --workers 8             # 8 concurrent synthesis workers
+    python german_audio.py create-all --workers 8 --encoders 4  # + 4 encoder processes
+    python german_audio.py create-all --batch                 # many sentences per TTS request
+    python german_audio.py create-all --shard 0/3             # this host's third of the keys
+    python german_audio.py create-all --lease                 # claim keys alongside other workers
+    python german_audio.py export-db                          # write DB snapshot to sentences.json
+    python german_audio.py import-db other.json               # upsert a JSON snapshot into the DB
     python german_audio.py test-voice
     python german_audio.py test-voice "Ich lerne jeden Tag Deutsch."
+    python german_audio.py test-voice --refresh               # re-check voices' rate support
+    python german_audio.py --help
 
 The import-wordlist command populates the sentence database from the leveled
 Goethe A1-B1 vocabulary in wordlists/goethe_a1-b1.tsv (each word's official
@@ -40,18 +55,54 @@ data's provenance.
 import-wordlist reuses each word's official Goethe example sentence. If you want
 freshly written, level-constrained sentences instead (for variety or extra
 practice), use generate-words — it asks Claude for a new sentence per word.
+
+By default the sentence database is data/sentences.json. For large databases set
+GERMAN_TTS_STORE=sqlite to keep it in data/sentences.db instead (seeded from
+sentences.json on first use); export-db then refreshes the JSON snapshot.
+create-all is safe to interrupt: finished clips are journaled as they land, so
+a rerun picks up where it stopped (and re-encodes any unjournaled leftovers
+from the clip cache rather than re-synthesizing them).
+Each rendered entry records a fingerprint of its texts and the audio settings
+(voices, SPEAKING_RATE, FORCE_POST_SLOWDOWN, PAUSE_MS, encoding, slowdown
+backend). After changing any of them, create-all re-renders just the clips
+they affect; list marks those with ↻.
+Commands can run side by side (e.g. generate-words in one terminal, create-all
+in another): database writes are made under a lock file and merged into the
+current contents rather than overwriting them.
+Set GERMAN_TTS_ENCODING=pcm to request uncompressed audio from TTS, so the final
+AAC encode is the only lossy pass (benchmarks/bench_audio.py measures the gain).
 """
 
 import os
 import io
 import json
 import sys
+import time
+import random
+import hashlib
+import sqlite3
+import re
+import wave
+import mmap
+import queue
+import struct
+import threading
 import subprocess
+import zlib
+from array import array
+from contextlib import contextmanager
+from types import SimpleNamespace
+from html import escape as _html_escape
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from google.cloud import texttospeech
-from google.api_core import exceptions as google_exceptions
-from pydub import AudioSegment
-import anthropic
+try:
+    import fcntl
+except ImportError:  # Windows: FileLock then only serializes threads
+    fcntl = None
+
+# google-cloud-texttospeech, pydub and anthropic are imported inside the
+# functions that use them: together they take longer to import than most
+# commands take to run (see benchmarks/bench_startup.py).
 
 # Configuration
 BASE_DIR = Path(__file__).resolve().parent
@@ -61,14 +112,64 @@ BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = Path(os.environ.get("GERMAN_TTS_DATA", BASE_DIR / "data"))
 AUDIO_DIR = Path(os.environ.get("GERMAN_TTS_OUTPUT", BASE_DIR / "output"))
 SENTENCES_FILE = DATA_DIR / "sentences.json"
+# Sentence storage backend. "json" reads and rewrites SENTENCES_FILE as a whole
+# (simple, and what git tracks). "sqlite" keeps SENTENCES_DB in WAL mode with
+# single-row updates, which stays fast as the database grows; sentences.json is
+# then just a snapshot, written/read with export-db / import-db.
+SENTENCE_STORE = os.environ.get("GERMAN_TTS_STORE", "json")
+SENTENCES_DB = DATA_DIR / "sentences.db"
+# Derived, disposable caches (synthesized clips etc.) live beside the audio.
+CACHE_DIR = Path(os.environ.get("GERMAN_TTS_CACHE", AUDIO_DIR / ".cache"))
+# Size cap for the synthesized-clip cache; least recently used clips are evicted.
+CLIP_CACHE_MAX_MB = int(os.environ.get("GERMAN_TTS_CLIP_CACHE_MB", 500))
+# Claude replies are cached by (model, prompt, max_tokens), so re-running an
+# import pipeline replays instantly. Entries expire after the TTL; pass
+# --no-cache to ignore cached replies and clips for one run.
+LLM_CACHE_TTL_DAYS = 30
+LLM_CACHE_MAX_MB = 50
 # Leveled Goethe A1-B1 vocabulary (word + official example sentence + translation),
 # built from the Goethe-Institut Wortlisten. See wordlists/README.md for provenance.
 WORDLIST_FILE = BASE_DIR / "wordlists" / "goethe_a1-b1.tsv"
+# Compiled, frequency-sorted index of WORDLIST_FILE (see WordlistIndex). Rebuilt
+# automatically whenever the TSV's size or mtime changes; kept in CACHE_DIR
+# instead when the wordlists dir is read-only.
+WORDLIST_INDEX = WORDLIST_FILE.with_suffix(".idx")
 CEFR_LEVELS = ("A1", "A2", "B1")
 # freq_rank value for words absent from the frequency corpus (they sort last).
 NO_FREQ_RANK = 10 ** 7
 # Claude model used for sentence generation.
 MODEL = "claude-sonnet-5"
+# generate-words sends its word batches to Claude concurrently, up to this many
+# at once, and retries a failed batch this many times before giving up on it.
+LLM_CONCURRENCY = 4
+LLM_BATCH_RETRIES = 3
+# generate-words --batch submits all word batches as one asynchronous Message
+# Batch (cheaper, no rate-limit juggling). Its ID is kept in this file until the
+# results are merged, so an interrupted run resumes polling instead of resubmitting.
+MESSAGE_BATCH_STATE = DATA_DIR / "pending_message_batches.json"
+MESSAGE_BATCH_POLL_SECONDS = 30
+# create-all appends each finished key to this journal and folds it into the
+# sentence database every RENDER_JOURNAL_FLUSH_EVERY clips (and at the end), so
+# a long run doesn't rewrite the database per clip. Anything an interrupted run
+# left in the journal is applied by the next create-all.
+RENDER_JOURNAL = DATA_DIR / "render_journal.log"
+RENDER_JOURNAL_FLUSH_EVERY = 50
+# create-all --lease: workers on any host sharing DATA_DIR/AUDIO_DIR claim
+# pending keys RENDER_LEASE_CHUNK at a time. A lease that isn't released within
+# RENDER_LEASE_SECONDS (its worker died) lapses and the keys are claimed again,
+# so keep it well above the time one chunk takes to render. A key rendered under
+# a lease stays in the book as done (with its fingerprint) for
+# RENDER_LEASE_DONE_SECONDS, so workers whose snapshot predates it skip it.
+RENDER_LEASES = DATA_DIR / "render_leases.json"
+RENDER_LEASE_CHUNK = 20
+RENDER_LEASE_SECONDS = 900
+RENDER_LEASE_DONE_SECONDS = 86400
+# A worker with nothing left to claim while others still hold leases on pending
+# keys re-checks this often, so a dead worker's keys are picked up once they lapse.
+RENDER_LEASE_POLL_SECONDS = 15
+# The pipeline command holds at most this many imported/generated entries waiting
+# for audio; a full queue pauses the import/generation side until workers catch up.
+PIPELINE_QUEUE_SIZE = 64
 # Per-level guidance injected into the generation prompt so Claude stays within
 # the vocabulary and grammar a learner at that level is expected to know.
 LEVEL_GUIDANCE = {
@@ -94,6 +195,36 @@ SPEAKING_RATE = 0.85
 # the API rate entirely and slow the audio in post-processing (pitch-preserving
 # via ffmpeg's atempo filter) instead. Leave False to try the API rate first.
 FORCE_POST_SLOWDOWN = False
+# Audio encoding requested from TTS. "mp3" is compact on the wire. "pcm"
+# (LINEAR16 WAV) skips the MP3 decode, keeps post-slowdown lossless, and leaves
+# the final AAC export as the only lossy codec pass per clip.
+TTS_ENCODING = os.environ.get("GERMAN_TTS_ENCODING", "mp3")
+# How post-processing slowdown is done. "ffmpeg" runs one atempo subprocess per
+# clip (works with any encoding). "wsola" time-stretches PCM in-process with
+# NumPy (pitch-preserving, no process startup); it needs TTS_ENCODING="pcm" and
+# numpy installed, and falls back to ffmpeg otherwise.
+SLOWDOWN_BACKEND = os.environ.get("GERMAN_TTS_SLOWDOWN", "ffmpeg")
+# Silence between the German and English halves of each clip.
+PAUSE_MS = 1000
+
+# create-all --batch packs up to this many same-language sentences into one SSML
+# request, with <mark> tags around each, and slices the audio back apart using the
+# returned mark timepoints. Google caps a request's input at 5000 bytes; the pause
+# between packed sentences keeps their audio from running together.
+TTS_BATCH_SENTENCES = 40
+TTS_MAX_INPUT_BYTES = 5000
+TTS_BATCH_GAP_MS = 300
+# GERMAN_TTS_FAKE=1 swaps in FakeTTSClient: offline, no credentials, no cost.
+# Useful for exercising batch slicing and the render pipeline.
+FAKE_TTS = os.environ.get("GERMAN_TTS_FAKE") == "1"
+
+# Google TTS quotas are per minute (and per project), so concurrent create-all
+# workers share one token bucket sized to this request rate. Each clip costs two
+# synthesize_speech calls. Override with GERMAN_TTS_RPM if your quota differs.
+TTS_REQUESTS_PER_MINUTE = int(os.environ.get("GERMAN_TTS_RPM", 200))
+# How many times a quota (ResourceExhausted) or availability (ServiceUnavailable)
+# error is retried, with exponential backoff, before the clip is given up on.
+TTS_MAX_RETRIES = 6
 
 
 def _slugify(text, maxlen=60):
@@ -114,53 +245,1088 @@ def _parse_level_and_limit(args):
     return level, limit
 
 
-class GermanAudioGenerator:
+def _pop_option(args, name, default=None):
+    """Remove `name VALUE` (or `name=VALUE`) from args and return VALUE, else default."""
+    for i, a in enumerate(args):
+        if a == name and i + 1 < len(args):
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        if a.startswith(name + "="):
+            del args[i]
+            return a.split("=", 1)[1]
+    return default
+
+
+def _wsola_stretch(samples, tempo, sample_rate):
+    """Pitch-preserving time-stretch of mono float samples (WSOLA).
+
+    Overlap-adds Hann-windowed 30 ms frames at a fixed output hop, reading the
+    input at hop*tempo. Each frame's read position is nudged by up to ±7.5 ms
+    to the offset that best correlates with the natural continuation of the
+    previous frame, which avoids the phasing artifacts of plain OLA.
+    """
+    import numpy as np
+
+    frame = int(sample_rate * 0.03)
+    hop_out = frame // 2
+    hop_in = hop_out * tempo
+    tolerance = frame // 4
+    window = np.hanning(frame).astype(np.float32)
+    padded = np.concatenate([np.zeros(tolerance, np.float32), samples,
+                             np.zeros(frame + 2 * tolerance + hop_out, np.float32)])
+    n_frames = max(1, int(len(samples) / hop_in))
+    out = np.zeros(n_frames * hop_out + frame, np.float32)
+    norm = np.zeros_like(out)
+    prev = tolerance
+    for k in range(n_frames):
+        center = int(k * hop_in) + tolerance
+        if k:
+            natural = padded[prev + hop_out:prev + hop_out + frame]
+            region = padded[center - tolerance:center + tolerance + frame]
+            center += int(np.argmax(np.correlate(region, natural))) - tolerance
+        start = k * hop_out
+        out[start:start + frame] += padded[center:center + frame] * window
+        norm[start:start + frame] += window
+        prev = center
+    out /= np.maximum(norm, 1e-3)
+    return out[:int(len(samples) / tempo)]
+
+
+_numpy_warned = False
+
+
+def _wsola_slow_wav(wav_bytes, tempo):
+    """Slow 16-bit mono WAV bytes in-process; returns None if WSOLA can't be used."""
+    global _numpy_warned
+    try:
+        import numpy as np
+    except ImportError:
+        if not _numpy_warned:
+            print("  ⚠ numpy not installed; using ffmpeg for slowdown")
+            _numpy_warned = True
+        return None
+    with wave.open(io.BytesIO(wav_bytes)) as w:
+        params = w.getparams()
+        frames = w.readframes(params.nframes)
+    if params.nchannels != 1 or params.sampwidth != 2:
+        return None
+    samples = np.frombuffer(frames, dtype="<i2").astype(np.float32)
+    stretched = _wsola_stretch(samples, tempo, params.framerate)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(params.framerate)
+        w.writeframes(np.clip(stretched, -32768, 32767).astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def _slow_audio(audio, tempo, backend=None):
+    """Slow synthesized audio without changing pitch.
+
+    Uses SLOWDOWN_BACKEND: in-process WSOLA for PCM, else ffmpeg's atempo
+    filter. atempo accepts 0.5-2.0; SPEAKING_RATE is expected to be within that.
+    The output container matches the input (MP3, or lossless WAV for PCM).
+    Returns the processed bytes, or the original bytes on failure.
+    """
+    if tempo == 1.0:
+        return audio
+    if (backend or SLOWDOWN_BACKEND) == "wsola" and _is_wav(audio):
+        slowed = _wsola_slow_wav(audio, tempo)
+        if slowed is not None:
+            return slowed
+    out_format = "wav" if _is_wav(audio) else "mp3"
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error",
+             "-i", "pipe:0", "-filter:a", f"atempo={tempo}",
+             "-f", out_format, "pipe:1"],
+            input=audio,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+        return result.stdout
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"  ⚠ Post-processing slowdown failed ({e}); using original speed")
+        return audio
+
+
+def _pack_ssml_batches(texts, max_bytes=TTS_MAX_INPUT_BYTES):
+    """Pack texts into SSML documents, yielding (indices, ssml) per request.
+
+    Each text is wrapped as <mark name="sN"/>text<mark name="eN"/> (N counts from
+    0 within the request) followed by a short break, and a request is closed once
+    it would exceed max_bytes or TTS_BATCH_SENTENCES sentences.
+    """
+    def marked(n, text):
+        text = _html_escape(text, quote=False)
+        return (f'<mark name="s{n}"/>{text}<mark name="e{n}"/>'
+                f'<break time="{TTS_BATCH_GAP_MS}ms"/>')
+
+    shell = len("<speak></speak>")
+    indices, parts, size = [], [], shell
+    for i, text in enumerate(texts):
+        part = marked(len(indices), text)
+        if indices and (size + len(part.encode("utf-8")) > max_bytes
+                        or len(indices) >= TTS_BATCH_SENTENCES):
+            yield indices, "<speak>" + "".join(parts) + "</speak>"
+            indices, parts, size = [], [], shell
+            part = marked(0, text)
+        indices.append(i)
+        parts.append(part)
+        size += len(part.encode("utf-8"))
+    if indices:
+        yield indices, "<speak>" + "".join(parts) + "</speak>"
+
+
+def _slice_wav(wav_bytes, spans):
+    """Cut WAV bytes into one WAV clip per (start_seconds, end_seconds) span."""
+    with wave.open(io.BytesIO(wav_bytes)) as w:
+        params = w.getparams()
+        frames = memoryview(w.readframes(params.nframes))
+    width = params.sampwidth * params.nchannels
+    total = len(frames) // width
+    clips = []
+    for start, end in spans:
+        a = min(total, max(0, round(start * params.framerate)))
+        b = min(total, max(a, round(end * params.framerate)))
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as out:
+            out.setnchannels(params.nchannels)
+            out.setsampwidth(params.sampwidth)
+            out.setframerate(params.framerate)
+            out.writeframes(frames[a * width:b * width])
+        clips.append(buf.getvalue())
+    return clips
+
+
+class FakeTTSClient:
+    """Offline stand-in for TextToSpeechClient (GERMAN_TTS_FAKE=1).
+
+    Returns 16-bit mono 24 kHz WAV whatever encoding is requested: a tone whose
+    length follows the text (and speaking_rate), silence for <break>s, and SSML
+    <mark> timepoints like v1beta1's enable_time_pointing. Accepts both the
+    keyword-argument and request= call styles.
+    """
+
+    SAMPLE_RATE = 24000
+    MS_PER_CHAR = 40
+    TOKEN = re.compile(r'<mark name="([^"]*)"/>|<break time="(\d+)ms"/>|<[^>]+>')
+
+    def synthesize_speech(self, request=None, **kwargs):
+        req = request if request is not None else SimpleNamespace(**kwargs)
+        source = getattr(req.input, "ssml", None) or req.input.text
+        rate = getattr(req.audio_config, "speaking_rate", None) or 1.0
+        pcm, timepoints, pos = bytearray(), [], 0
+        for match in [*self.TOKEN.finditer(source), None]:
+            end = match.start() if match else len(source)
+            spoken = source[pos:end].strip()
+            if spoken:
+                frames = int(len(spoken) * self.MS_PER_CHAR / rate * self.SAMPLE_RATE / 1000)
+                pcm += (b"\x00\x20\x00\xe0" * (frames // 2 + 1))[:frames * 2]
+            if match is None:
+                break
+            if match.group(1) is not None:
+                timepoints.append(SimpleNamespace(
+                    mark_name=match.group(1),
+                    time_seconds=len(pcm) / 2 / self.SAMPLE_RATE))
+            elif match.group(2) is not None:
+                pcm += bytes(int(match.group(2)) * self.SAMPLE_RATE // 1000 * 2)
+            pos = match.end()
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.SAMPLE_RATE)
+            w.writeframes(bytes(pcm))
+        return SimpleNamespace(audio_content=buf.getvalue(), timepoints=timepoints)
+
+
+def _is_wav(audio):
+    """True for RIFF/WAV bytes (LINEAR16 synthesis, sliced batch clips)."""
+    return bytes(audio[:4]) == b"RIFF"
+
+
+def _decode_clip(audio):
+    """Decode synthesized bytes into an AudioSegment, in memory.
+
+    BytesIO over the bytes shares their buffer (no copy). WAV (pcm) is parsed
+    by pydub directly; MP3 is streamed through an ffmpeg decode.
+    """
+    from pydub import AudioSegment
+    if _is_wav(audio):
+        return AudioSegment.from_wav(io.BytesIO(audio))
+    return AudioSegment.from_mp3(io.BytesIO(audio))
+
+
+def _mix_clip(german_audio, english_audio):
+    """Join the German and English clips with a PAUSE_MS pause between.
+
+    Nothing touches disk, so any number of workers can render into the same
+    output dir at once.
+    """
+    from pydub import AudioSegment
+    silence = AudioSegment.silent(duration=PAUSE_MS)
+    return _decode_clip(german_audio) + silence + _decode_clip(english_audio)
+
+
+def _encode_clip(german_audio, english_audio, output_file):
+    """Mix a synthesized pair and export it as AAC to output_file.
+
+    Top-level (picklable) so create-all can run it in encoder processes.
+    """
+    combined = _mix_clip(german_audio, english_audio)
+    # Export final file using AAC (mp3 encoder not available in your ffmpeg).
+    # Encode under a private name and rename into place, so concurrent
+    # renderers sharing this dir never see (or clobber) a half-written file.
+    output_file = Path(output_file)
+    partial = output_file.with_name(
+        f".{output_file.name}.{os.getpid()}.{threading.get_ident()}.part")
+    combined.export(partial, format="ipod", codec="aac", bitrate="128k")
+    _fsync_path(partial)
+    os.replace(partial, output_file)
+    return output_file
+
+
+def _clip_cache_key(text, language_code, voice_name, api_rate, post_tempo, encoding):
+    """Clip-cache key for one synthesized sentence.
+
+    A post-slowed clip also depends on the slowdown backend; clips that weren't
+    slowed keep the key they always had.
+    """
+    parts = [text, language_code, voice_name, api_rate, post_tempo, encoding]
+    if post_tempo != 1.0:
+        parts.append(SLOWDOWN_BACKEND)
+    return DiskCache.make_key(*parts)
+
+
+def _audio_fingerprint(entry, encoding=TTS_ENCODING, post_slowed=FORCE_POST_SLOWDOWN):
+    """Short hash of everything that shapes an entry's rendered clip.
+
+    Covers the voices, rate, the encoding the speech was synthesized in (--batch
+    always uses LINEAR16), the pause and both texts; the slowdown backend only
+    counts when the clips are slowed in post-processing (post_slowed), so
+    switching it doesn't touch clips the API slowed. Stored as the entry's
+    audio_fingerprint when it's rendered.
+    """
+    parts = [GERMAN_VOICE, ENGLISH_VOICE, SPEAKING_RATE, FORCE_POST_SLOWDOWN, encoding,
+             PAUSE_MS, entry["german"], entry["english"]]
+    if post_slowed and SPEAKING_RATE != 1.0:
+        parts.append(SLOWDOWN_BACKEND)
+    return DiskCache.make_key(*parts)[:16]
+
+
+def _needs_audio(entry, post_slowed=FORCE_POST_SLOWDOWN):
+    """True if an entry has no audio yet, or audio rendered under other settings.
+
+    A clip synthesized as LINEAR16 (--batch) counts as current whatever
+    TTS_ENCODING says. Entries rendered before fingerprints existed carry none
+    and count as current (create-all stamps them, so later changes are caught).
+    """
+    if not entry.get("audio_generated", False):
+        return True
+    fingerprint = entry.get("audio_fingerprint")
+    return fingerprint is not None and fingerprint not in {
+        _audio_fingerprint(entry, encoding, post_slowed) for encoding in (TTS_ENCODING, "pcm")}
+
+
+def _fsync_path(path):
+    """Flush a written file to disk, so a rename after it can't expose a torn file."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_text(path, text):
+    """Replace path with text all at once: a crash leaves the old or new file, never half."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class FileLock:
+    """Exclusive lock held through flock() on a sidecar file.
+
+    Serializes threads and processes alike, and is reentrant within a thread,
+    so a locked section can call methods that take the same lock. On Linux,
+    flock on an NFS mount is carried out as an NFS byte-range lock, so the
+    lock also holds across hosts sharing a data dir.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            os.close(self._fd)  # closing the descriptor drops the flock
+            self._fd = None
+        self._thread_lock.release()
+
+
+def _pop_flag(args, name):
+    """Remove every occurrence of flag `name` from args; return whether it was there."""
+    present = name in args
+    args[:] = [a for a in args if a != name]
+    return present
+
+
+class JsonArrayStream:
+    """Incremental parser for a streamed JSON array of objects.
+
+    feed() takes the next chunk of text and returns every object that is now
+    complete, so callers can act on each {word, german, english} as soon as it
+    has arrived. Text around the array (a ```json fence, the brackets, commas)
+    is skipped; an object cut off by a truncated response is simply never
+    returned.
+    """
+
     def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        objects = []
+        while True:
+            start = self.buffer.find("{", self.pos)
+            if start < 0:
+                break
+            try:
+                obj, end = self.decoder.raw_decode(self.buffer, start)
+            except json.JSONDecodeError:
+                break  # incomplete so far; wait for more text
+            objects.append(obj)
+            self.pos = end
+        # Drop consumed text so the buffer stays small.
+        self.buffer, self.pos = self.buffer[self.pos:], 0
+        return objects
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces calls to `rate_per_minute`.
+
+    The refill rate adapts to the server: throttle() halves it after a quota
+    error and recover() creeps it back toward the configured ceiling on each
+    success (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, rate_per_minute):
+        self.max_rate = rate_per_minute / 60.0   # tokens per second
+        self.rate = self.max_rate
+        self.capacity = max(1.0, self.max_rate)  # allow ~1 second of burst
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self):
+        with self.lock:
+            self.rate = max(self.max_rate / 32, self.rate / 2)
+
+    def recover(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class DiskCache:
+    """Content-addressed on-disk byte cache with a size cap and LRU eviction.
+
+    Values are stored one file per key (named by the key's SHA-256) under
+    `directory`. A file's mtime is when it was written (for the optional `ttl`,
+    in seconds) and a hit bumps its atime, so eviction removes the least
+    recently used files first once the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory, max_bytes, ttl=None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = None  # scanned on first write; reads never need it
+
+    @property
+    def size(self):
+        """Total bytes cached (the directory is walked once, on first use)."""
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self.directory.glob("*/*"))
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = value
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash arbitrary JSON-serializable parts into a cache key."""
+        blob = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / key
+
+    def get(self, key):
+        """Return the cached bytes for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            st = path.stat()
+            now = time.time()
+            if self.ttl is not None and now - st.st_mtime > self.ttl:
+                path.unlink(missing_ok=True)  # expired
+                with self.lock:
+                    if self._size is not None:
+                        self._size -= st.st_size
+                raise FileNotFoundError(path)
+            data = path.read_bytes()
+            os.utime(path, (now, st.st_mtime))  # mark as recently used
+        except FileNotFoundError:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self.lock:
+            self.size += len(data)
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until under 90% of the cap."""
+        files = []
+        for p in self.directory.glob("*/*"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_atime, st.st_size, p))
+        files.sort()
+        self.size = sum(f[1] for f in files)
+        target = self.max_bytes * 0.9
+        for _, size, p in files:
+            if self.size <= target:
+                break
+            p.unlink(missing_ok=True)
+            self.size -= size
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = f", {self.hits / total:.0%} hit rate" if total else ""
+        return (f"{self.hits} hits, {self.misses} misses{rate}; "
+                f"{self.size / 1e6:.1f} MB cached")
+
+
+class VoiceCapabilities:
+    """Persisted per-voice record of whether the API accepts speaking_rate.
+
+    Voices that reject the parameter are remembered, so later clips go straight
+    to normal-speed synthesis + post slowdown instead of a failed call first.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = FileLock(self.path.with_name(f".{self.path.name}.lock"))
+        self.voices = self._load()
+
+    def _load(self):
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def supports_rate(self, voice_name):
+        """True/False if known, None if this voice hasn't been tried yet."""
+        return self.voices.get(voice_name, {}).get("api_rate")
+
+    def record(self, voice_name, supported):
+        # Called for every synthesized clip: skip the lock and re-read when
+        # nothing would change.
+        if self.supports_rate(voice_name) == supported:
+            return
+        with self.lock:
+            self.voices = self._load()  # keep other processes' findings
+            if self.supports_rate(voice_name) == supported:
+                return
+            self.voices[voice_name] = {"api_rate": supported, "checked": int(time.time())}
+            self._save()
+
+    def forget(self, voice_name):
+        with self.lock:
+            self.voices = self._load()
+            if self.voices.pop(voice_name, None) is not None:
+                self._save()
+
+    def _save(self):
+        _atomic_write_text(self.path, json.dumps(self.voices, indent=2))
+
+
+def _parse_wordlist_line(line):
+    """Parse one wordlist TSV row into an entry dict (None for blank/short rows)."""
+    line = line.rstrip("\n")
+    if not line.strip():
+        return None
+    parts = line.split("\t")
+    if len(parts) < 4:
+        return None
+    lvl, word, german, english = parts[0], parts[1], parts[2], parts[3]
+    try:
+        freq_rank = int(parts[4]) if len(parts) > 4 else NO_FREQ_RANK
+    except ValueError:
+        freq_rank = NO_FREQ_RANK
+    return {"level": lvl, "word": word, "german": german,
+            "english": english, "freq_rank": freq_rank}
+
+
+class WordlistIndex:
+    """Compiled per-level index over the wordlist TSV for O(N) top-N lookups.
+
+    For each CEFR level (and "ALL") the index file stores three uint32 columns,
+    already sorted most-common-first: the byte offset and length of each row in
+    the TSV, and its freq_rank. A query memory-maps both files, reads the first
+    N offsets and parses just those N rows. The header records the TSV's size and
+    mtime; a mismatch triggers a rebuild (one full parse). The index is kept
+    next to the TSV, or at fallback_path when that directory can't be written
+    (e.g. a read-only checkout).
+
+    Layout (little-endian): header <4sIQqI> magic, version, tsv size, tsv
+    mtime_ns, section count; then per section <8sII> name, row count, byte
+    offset of its columns; then the columns themselves.
+    """
+
+    MAGIC = b"GWLI"
+    VERSION = 1
+    HEADER = struct.Struct("<4sIQqI")
+    SECTION = struct.Struct("<8sII")
+
+    def __init__(self, tsv_path, index_path, fallback_path=None):
+        self.tsv_path = Path(tsv_path)
+        self.index_path = Path(index_path)
+        self.fallback_path = Path(fallback_path) if fallback_path else None
+        if (self.fallback_path and not self._is_fresh()
+                and self._is_fresh(self.fallback_path)):
+            self.index_path = self.fallback_path
+
+    def _stamp(self):
+        st = self.tsv_path.stat()
+        return st.st_size, st.st_mtime_ns
+
+    def _is_fresh(self, path=None):
+        try:
+            with open(path or self.index_path, "rb") as f:
+                magic, version, size, mtime_ns, _ = self.HEADER.unpack(
+                    f.read(self.HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return False
+        return (magic, version, (size, mtime_ns)) == (self.MAGIC, self.VERSION, self._stamp())
+
+    def build(self):
+        """Parse the whole TSV once and write the sorted columns."""
+        size, mtime_ns = self._stamp()
+        data = self.tsv_path.read_bytes()
+        rows = []  # (freq_rank, file order, level, offset, length)
+        offset = data.find(b"\n") + 1  # skip the header row
+        while 0 < offset < len(data):
+            end = data.find(b"\n", offset)
+            end = len(data) if end < 0 else end + 1
+            entry = _parse_wordlist_line(data[offset:end].decode("utf-8"))
+            if entry:
+                rows.append((entry["freq_rank"], len(rows), entry["level"],
+                             offset, end - offset))
+            offset = end
+        # Most common first; ties (and unranked words) keep file/alphabetical order.
+        rows.sort()
+        sections = [("ALL", rows)] + [
+            (lvl, [r for r in rows if r[2] == lvl]) for lvl in CEFR_LEVELS]
+
+        pos = self.HEADER.size + self.SECTION.size * len(sections)
+        table, columns = [], []
+        for name, section in sections:
+            table.append(self.SECTION.pack(name.encode(), len(section), pos))
+            for field in (3, 4, 0):  # offset, length, freq_rank
+                col = array("I", (r[field] for r in section))
+                if sys.byteorder == "big":
+                    col.byteswap()
+                columns.append(col.tobytes())
+            pos += 12 * len(section)
+        blob = b"".join([self.HEADER.pack(self.MAGIC, self.VERSION, size, mtime_ns,
+                                          len(sections)), *table, *columns])
+        try:
+            self._write(self.index_path, blob)
+        except OSError:
+            if self.fallback_path is None or self.index_path == self.fallback_path:
+                raise
+            self.fallback_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write(self.fallback_path, blob)
+            self.index_path = self.fallback_path
+
+    @staticmethod
+    def _write(path, blob):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+
+    def top(self, level=None, limit=None):
+        """Entries for `level` (None = all levels), most common first, up to `limit`."""
+        if not self._is_fresh():
+            self.build()
+        name = (level or "ALL").encode().ljust(8, b"\0")
+        with open(self.index_path, "rb") as fi, open(self.tsv_path, "rb") as ft, \
+                mmap.mmap(fi.fileno(), 0, access=mmap.ACCESS_READ) as idx, \
+                mmap.mmap(ft.fileno(), 0, access=mmap.ACCESS_READ) as tsv:
+            n_sections = self.HEADER.unpack_from(idx)[4]
+            for i in range(n_sections):
+                sec_name, count, pos = self.SECTION.unpack_from(
+                    idx, self.HEADER.size + i * self.SECTION.size)
+                if sec_name == name:
+                    break
+            else:
+                return []
+            n = count if limit is None else min(limit, count)
+            offsets, lengths = array("I"), array("I")
+            offsets.frombytes(idx[pos:pos + 4 * n])
+            lengths.frombytes(idx[pos + 4 * count:pos + 4 * count + 4 * n])
+            if sys.byteorder == "big":
+                offsets.byteswap()
+                lengths.byteswap()
+            return [_parse_wordlist_line(tsv[o:o + ln].decode("utf-8"))
+                    for o, ln in zip(offsets, lengths)]
+
+
+class JsonSentenceStore:
+    """Sentence database kept as one JSON object (key -> entry) in a file.
+
+    Every write rewrites the whole file, so this suits small databases; use
+    SqliteSentenceStore for large ones. Writes re-read the file under a
+    FileLock and change only the entries they touch, so several processes
+    (e.g. generate-words next to create-all) can share it without losing each
+    other's updates. Reads need no lock: the file is replaced atomically.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = FileLock(self.path.with_name(f".{self.path.name}.lock"))
+        with self.lock:
+            if not self.path.exists():
+                self._save({})
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, sentences):
+        _atomic_write_text(self.path, json.dumps(sentences, indent=2, ensure_ascii=False))
+
+    def all(self):
+        """Return every entry as an ordered {key: entry} dict."""
+        return self._load()
+
+    def locked(self):
+        """Hold the store's write lock across several reads and writes."""
+        return self.lock
+
+    def get(self, key):
+        return self.all().get(key)
+
+    def count(self):
+        return len(self.all())
+
+    def replace_all(self, sentences):
+        """Overwrite the file with exactly these entries."""
+        with self.lock:
+            self._save(sentences)
+
+    def upsert_many(self, entries):
+        """Insert or replace several entries in one write."""
+        if not entries:
+            return
+        with self.lock:
+            sentences = self._load()
+            sentences.update(entries)
+            self._save(sentences)
+
+    def update(self, key, **fields):
+        """Set fields on one existing entry; returns False if the key is unknown."""
+        with self.lock:
+            sentences = self._load()
+            if key not in sentences:
+                return False
+            sentences[key].update(fields)
+            self._save(sentences)
+            return True
+
+    def update_many(self, keys, **fields):
+        """Set the same fields on several entries in one write; unknown keys are skipped."""
+        self.update_each({key: fields for key in keys})
+
+    def update_each(self, updates):
+        """Apply {key: fields} to several entries in one write; unknown keys are skipped."""
+        if not updates:
+            return
+        with self.lock:
+            sentences = self._load()
+            for key, fields in updates.items():
+                if key in sentences:
+                    sentences[key].update(fields)
+            self._save(sentences)
+
+
+class SqliteSentenceStore:
+    """Sentence database in SQLite (WAL mode), one row per entry.
+
+    Entries are stored as JSON text so they round-trip losslessly to the
+    sentences.json snapshot; insertion order is kept via the rowid. SQLite's
+    own locking makes it safe for several processes on one host; WAL needs
+    shared memory, so for hosts sharing an NFS data dir use the JSON store.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.local = threading.local()  # sqlite connections are per-thread
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS sentences "
+                         "(key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def all(self):
+        rows = self._conn().execute("SELECT key, data FROM sentences ORDER BY rowid")
+        return {key: json.loads(data) for key, data in rows}
+
+    def get(self, key):
+        row = self._conn().execute("SELECT data FROM sentences WHERE key = ?",
+                                   (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+
+    @contextmanager
+    def locked(self):
+        """Run the enclosed reads and writes as one BEGIN IMMEDIATE transaction.
+
+        Reentrant: store methods called inside join the open transaction.
+        """
+        conn = self._conn()
+        depth = getattr(self.local, "depth", 0)
+        if depth:
+            self.local.depth = depth + 1
+            try:
+                yield conn
+            finally:
+                self.local.depth = depth
+            return
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")  # take the write lock up front
+            self.local.depth = 1
+            try:
+                yield conn
+            finally:
+                self.local.depth = 0
+
+    def upsert_many(self, entries):
+        # ON CONFLICT ... DO UPDATE keeps the existing rowid, so order is stable.
+        with self.locked() as conn:
+            conn.executemany(
+                "INSERT INTO sentences (key, data) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                [(k, json.dumps(v, ensure_ascii=False)) for k, v in entries.items()])
+
+    def update(self, key, **fields):
+        with self.locked() as conn:  # read-modify-write under the write lock
+            row = conn.execute("SELECT data FROM sentences WHERE key = ?",
+                               (key,)).fetchone()
+            if row is None:
+                return False
+            entry = json.loads(row[0])
+            entry.update(fields)
+            conn.execute("UPDATE sentences SET data = ? WHERE key = ?",
+                         (json.dumps(entry, ensure_ascii=False), key))
+            return True
+
+    def update_many(self, keys, **fields):
+        self.update_each({key: fields for key in keys})
+
+    def update_each(self, updates):
+        with self.locked() as conn:
+            for key, fields in updates.items():
+                row = conn.execute("SELECT data FROM sentences WHERE key = ?",
+                                   (key,)).fetchone()
+                if row is None:
+                    continue
+                entry = json.loads(row[0])
+                entry.update(fields)
+                conn.execute("UPDATE sentences SET data = ? WHERE key = ?",
+                             (json.dumps(entry, ensure_ascii=False), key))
+
+
+def _worker_id():
+    """host:pid, unique among processes sharing a data dir."""
+    import socket
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _open_store(kind=None):
+    """Open the configured sentence store ("json" or "sqlite")."""
+    kind = kind or SENTENCE_STORE
+    if kind == "json":
+        return JsonSentenceStore(SENTENCES_FILE)
+    if kind == "sqlite":
+        is_new = not SENTENCES_DB.exists()
+        store = SqliteSentenceStore(SENTENCES_DB)
+        if is_new and SENTENCES_FILE.exists():
+            # Seed a fresh database from the git-tracked snapshot.
+            store.upsert_many(JsonSentenceStore(SENTENCES_FILE).all())
+        return store
+    raise ValueError(f"Unknown sentence store '{kind}' (use 'json' or 'sqlite')")
+
+
+class RenderJournal:
+    """Append-only log of sentence keys whose audio has been written.
+
+    Each key (tab, its audio fingerprint) is appended and fsynced right after
+    its .m4a is renamed into place, then the log is periodically folded into
+    the sentence database and truncated. A crash loses at most a torn final line, never a finished clip.
+    Appends and commits hold a FileLock, so concurrent create-all processes
+    can share one journal.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = FileLock(self.path.with_name(f".{self.path.name}.lock"))
+
+    def append(self, key, fingerprint):
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(f"{key}\t{fingerprint}\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _entries(self):
+        try:
+            text = self.path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return {}
+        # Only newline-terminated lines are complete; a torn tail is dropped.
+        lines = text.split("\n")[:-1]
+        return dict(line.partition("\t")[::2] for line in lines)
+
+    def commit(self, apply):
+        """Pass the journal as {key: fingerprint} to apply(), then empty it.
+
+        Returns the number of keys applied. If apply raises, the journal is
+        kept so the next commit retries.
+        """
+        with self.lock:
+            entries = self._entries()
+            if entries:
+                apply(entries)
+            self.path.unlink(missing_ok=True)
+            return len(entries)
+
+
+class LeaseBook:
+    """Expiring claims on sentence keys, shared by create-all workers.
+
+    Leases live in one small JSON file that is only read and rewritten under a
+    FileLock, so a claim is atomic across processes and hosts. A key is either
+    leased ({"owner", "expires"}) or done ({"done": fingerprint, "expires"}):
+    release() turns the keys a worker rendered into done markers, and claim()
+    skips a key whose done fingerprint matches the one it is asked for, so a
+    worker whose pending snapshot predates someone else's render doesn't
+    render it twice. Expired entries count as free.
+    """
+
+    def __init__(self, path, ttl=RENDER_LEASE_SECONDS, done_ttl=RENDER_LEASE_DONE_SECONDS):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.done_ttl = done_ttl
+        self.lock = FileLock(self.path.with_name(f".{self.path.name}.lock"))
+
+    def _load(self):
+        try:
+            leases = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        now = time.time()
+        return {k: v for k, v in leases.items() if v["expires"] > now}
+
+    def _save(self, leases):
+        if leases:
+            _atomic_write_text(self.path, json.dumps(leases, indent=2, ensure_ascii=False))
+        else:
+            self.path.unlink(missing_ok=True)
+
+    def claim(self, pending, limit, owner):
+        """Lease up to `limit` of the pending {key: fingerprint} that nobody else
+        holds and nobody has rendered at that fingerprint; returns their keys."""
+        with self.lock:
+            leases = self._load()
+            claimed = [k for k, fingerprint in pending.items()
+                       if k not in leases
+                       or ("done" in leases[k] and leases[k]["done"] != fingerprint)][:limit]
+            expires = time.time() + self.ttl
+            for key in claimed:
+                leases[key] = {"owner": owner, "expires": expires}
+            self._save(leases)
+            return claimed
+
+    def held_until(self, pending, owner):
+        """When the first of other owners' leases on pending keys lapses, or None
+        if no such lease is held (the keys are free or already done)."""
+        with self.lock:
+            leases = self._load()
+        expiries = [leases[k]["expires"] for k in pending
+                    if k in leases and "done" not in leases[k]
+                    and leases[k]["owner"] != owner]
+        return min(expiries, default=None)
+
+    def release(self, keys, owner, done=None):
+        """Drop this owner's leases on keys (others' leases are left alone).
+
+        Keys in `done` ({key: fingerprint}) are recorded as rendered instead.
+        """
+        done = done or {}
+        with self.lock:
+            leases = self._load()
+            expires = time.time() + self.done_ttl
+            for key in keys:
+                if leases.get(key, {}).get("owner") != owner:
+                    continue
+                if key in done:
+                    leases[key] = {"done": done[key], "expires": expires}
+                else:
+                    del leases[key]
+            self._save(leases)
+
+
+class GermanAudioGenerator:
+    def __init__(self, use_cache=True):
         self.audio_dir = AUDIO_DIR
         self.data_dir = DATA_DIR
         self.sentences_file = SENTENCES_FILE
-        self.tts_client = texttospeech.TextToSpeechClient()
+        self._tts_client = None
+        self._tts_beta_client = None
+        self._anthropic = None
+        self.rate_limiter = TokenBucket(TTS_REQUESTS_PER_MINUTE)
+        # use_cache=False ignores cached clips/replies (fresh results still refresh them).
+        self.use_cache = use_cache
+        self.clip_cache = DiskCache(CACHE_DIR / "clips", CLIP_CACHE_MAX_MB * 10 ** 6)
+        self.llm_cache = DiskCache(CACHE_DIR / "llm", LLM_CACHE_MAX_MB * 10 ** 6,
+                                   ttl=LLM_CACHE_TTL_DAYS * 86400)
+        self.voice_caps = VoiceCapabilities(CACHE_DIR / "voices.json")
+        self.tts_calls = 0
+        # Guards shared counters when create-all runs concurrently.
+        self._lock = threading.RLock()
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Initialize sentence database
-        if not self.sentences_file.exists():
-            self._save_sentences({})
-    
-    def _load_sentences(self):
-        """Load sentences from JSON database"""
-        with open(self.sentences_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        self.store = _open_store()
+        self.journal = RenderJournal(RENDER_JOURNAL)
+        self._journaled = 0
+
+    def export_snapshot(self, path=None):
+        """Write the whole sentence database to a JSON snapshot (default sentences.json)."""
+        path = Path(path) if path else self.sentences_file
+        sentences = self.store.all()
+        JsonSentenceStore(path).replace_all(sentences)
+        print(f"✓ Exported {len(sentences)} sentences to {path}")
+
+    def import_snapshot(self, path=None):
+        """Upsert every entry from a JSON snapshot into the sentence database."""
+        path = Path(path) if path else self.sentences_file
+        sentences = JsonSentenceStore(path).all()
+        self.store.upsert_many(sentences)
+        print(f"✓ Imported {len(sentences)} sentences from {path}")
+        print(f"✓ Total sentences in database: {self.store.count()}")
     
-    def _save_sentences(self, sentences):
-        """Save sentences to JSON database"""
-        with open(self.sentences_file, 'w', encoding='utf-8') as f:
-            json.dump(sentences, f, indent=2, ensure_ascii=False)
-    
-    def _slow_audio(self, mp3_bytes, tempo):
-        """Slow MP3 audio using ffmpeg's atempo filter (preserves pitch).
+    def _tts_request(self, client=None, **request):
+        """Call synthesize_speech through the rate limiter, backing off on quota errors.
 
-        atempo accepts 0.5-2.0; SPEAKING_RATE is expected to be within that.
-        Returns the processed MP3 bytes, or the original bytes on failure.
+        ResourceExhausted / ServiceUnavailable are retried with jittered exponential
+        backoff (and slow the shared token bucket); other errors propagate.
         """
-        if tempo == 1.0:
-            return mp3_bytes
-        try:
-            result = subprocess.run(
-                ["ffmpeg", "-hide_banner", "-loglevel", "error",
-                 "-i", "pipe:0", "-filter:a", f"atempo={tempo}",
-                 "-f", "mp3", "pipe:1"],
-                input=mp3_bytes,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True,
-            )
-            return result.stdout
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            print(f"  ⚠ Post-processing slowdown failed ({e}); using original speed")
-            return mp3_bytes
-
-    def _synthesize_speech(self, text, language_code, voice_name):
+        from google.api_core import exceptions as google_exceptions
+        client = client or self.tts_client
+        delay = 1.0
+        for attempt in range(TTS_MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = client.synthesize_speech(**request)
+            except (google_exceptions.ResourceExhausted,
+                    google_exceptions.ServiceUnavailable) as e:
+                if attempt == TTS_MAX_RETRIES:
+                    raise
+                self.rate_limiter.throttle()
+                wait = delay * (1 + random.random())
+                print(f"  ⚠ TTS {type(e).__name__}; retrying in {wait:.1f}s")
+                time.sleep(wait)
+                delay = min(delay * 2, 60.0)
+            else:
+                self.rate_limiter.recover()
+                with self._lock:
+                    self.tts_calls += 1
+                return response
+
+    def _synthesize_speech(self, text, language_code, voice_name, use_cache=True):
         """Generate speech using Google Cloud TTS.
 
         Tries to apply SPEAKING_RATE at the API level. If the chosen voice
@@ -168,7 +1334,27 @@ class GermanAudioGenerator:
         synthesizing at normal speed and slowing the audio in post-processing.
         Set FORCE_POST_SLOWDOWN=True to always slow in post (for voices that
         silently ignore the API rate rather than rejecting it).
+
+        Whether a voice rejects speaking_rate is remembered in voice_caps, so the
+        failed first attempt only happens once per voice.
+
+        Results are cached on disk keyed by the text and every setting that
+        affects the audio, so repeated or duplicate texts cost no API calls.
         """
+        # Decide whether the API applies the rate or we do it afterwards.
+        post_slowdown = (FORCE_POST_SLOWDOWN
+                         or self.voice_caps.supports_rate(voice_name) is False)
+        api_rate = 1.0 if post_slowdown else SPEAKING_RATE
+        post_tempo = SPEAKING_RATE if post_slowdown else 1.0
+
+        cache_key = _clip_cache_key(text, language_code, voice_name, api_rate,
+                                    post_tempo, TTS_ENCODING)
+        cached = self.clip_cache.get(cache_key) if use_cache and self.use_cache else None
+        if cached is not None:
+            return cached
+
+        from google.cloud import texttospeech
+        from google.api_core import exceptions as google_exceptions
         synthesis_input = texttospeech.SynthesisInput(text=text)
 
         voice = texttospeech.VoiceSelectionParams(
@@ -176,16 +1362,14 @@ class GermanAudioGenerator:
             name=voice_name
         )
 
-        # Decide whether the API applies the rate or we do it afterwards.
-        api_rate = 1.0 if FORCE_POST_SLOWDOWN else SPEAKING_RATE
-        post_tempo = SPEAKING_RATE if FORCE_POST_SLOWDOWN else 1.0
-
         def _synthesize(rate):
             audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
+                audio_encoding=(texttospeech.AudioEncoding.LINEAR16
+                                if TTS_ENCODING == "pcm"
+                                else texttospeech.AudioEncoding.MP3),
                 speaking_rate=rate  # Slightly slower for learning
             )
-            return self.tts_client.synthesize_speech(
+            return self._tts_request(
                 input=synthesis_input,
                 voice=voice,
                 audio_config=audio_config
@@ -193,14 +1377,114 @@ class GermanAudioGenerator:
 
         try:
             audio = _synthesize(api_rate)
+            if api_rate != 1.0:
+                self.voice_caps.record(voice_name, True)
         except google_exceptions.InvalidArgument:
+            if api_rate == 1.0:
+                raise  # not a speaking_rate problem
             # Voice rejected speaking_rate — retry at normal speed and slow in post.
             print(f"  ⚠ '{voice_name}' rejected speaking_rate; slowing in post-processing")
             audio = _synthesize(1.0)
+            # Only now is it the rate that was rejected (the text is fine at 1.0).
+            self.voice_caps.record(voice_name, False)
             post_tempo = SPEAKING_RATE
-
-        return self._slow_audio(audio, post_tempo)
+            cache_key = _clip_cache_key(text, language_code, voice_name, 1.0,
+                                        post_tempo, TTS_ENCODING)
+
+        slowed = _slow_audio(audio, post_tempo)
+        # Don't cache a clip whose slowdown failed (it came back at normal speed).
+        if post_tempo == 1.0 or slowed is not audio:
+            self.clip_cache.put(cache_key, slowed)
+        return slowed
     
+    def _synthesize_marked(self, ssml, count, language_code, voice_name, rate):
+        """Synthesize one packed SSML request and slice it into `count` WAV clips.
+
+        Uses the v1beta1 API, which reports when each <mark> was reached. Returns
+        None if the voice didn't report every mark (not all voices support them).
+        """
+        from google.cloud import texttospeech_v1beta1 as tts_beta
+
+        if self._tts_beta_client is None:
+            self._tts_beta_client = (FakeTTSClient() if FAKE_TTS
+                                     else tts_beta.TextToSpeechClient())
+        request = tts_beta.SynthesizeSpeechRequest(
+            input=tts_beta.SynthesisInput(ssml=ssml),
+            voice=tts_beta.VoiceSelectionParams(language_code=language_code,
+                                                name=voice_name),
+            audio_config=tts_beta.AudioConfig(
+                audio_encoding=tts_beta.AudioEncoding.LINEAR16, speaking_rate=rate),
+            enable_time_pointing=[tts_beta.SynthesizeSpeechRequest.TimepointType.SSML_MARK],
+        )
+        response = self._tts_request(client=self._tts_beta_client, request=request)
+        marks = {tp.mark_name: tp.time_seconds for tp in response.timepoints}
+        spans = [(marks.get(f"s{i}"), marks.get(f"e{i}")) for i in range(count)]
+        if any(start is None or end is None for start, end in spans):
+            return None
+        return _slice_wav(response.audio_content, spans)
+
+    def _synthesize_batch(self, texts, language_code, voice_name):
+        """Synthesize many same-language texts in as few requests as possible.
+
+        Texts already in the clip cache are served from it; the rest are packed
+        into SSML requests (see _pack_ssml_batches) and sliced back apart by mark
+        timepoints into per-sentence WAV clips. A request that comes back without
+        usable timepoints, or is rejected even at normal speed, falls back to one
+        call per sentence. Returns one clip per text, in order.
+        """
+        post_slowdown = (FORCE_POST_SLOWDOWN
+                         or self.voice_caps.supports_rate(voice_name) is False)
+        api_rate = 1.0 if post_slowdown else SPEAKING_RATE
+        post_tempo = SPEAKING_RATE if post_slowdown else 1.0
+
+        def cache_key(text):
+            return _clip_cache_key(text, language_code, voice_name, api_rate,
+                                   post_tempo, "pcm")
+
+        clips = {}
+        for text in texts:
+            cached = self.clip_cache.get(cache_key(text)) if self.use_cache else None
+            if cached is not None:
+                clips[text] = cached
+        missing = [t for t in dict.fromkeys(texts) if t not in clips]
+
+        from google.api_core import exceptions as google_exceptions
+        for indices, ssml in _pack_ssml_batches(missing):
+            chunk = [missing[i] for i in indices]
+            rejected = None
+            try:
+                sliced = self._synthesize_marked(ssml, len(chunk), language_code,
+                                                 voice_name, api_rate)
+                if api_rate != 1.0:
+                    self.voice_caps.record(voice_name, True)
+            except google_exceptions.InvalidArgument as e:
+                sliced, rejected = None, e
+            if rejected is not None and api_rate != 1.0:
+                print(f"  ⚠ '{voice_name}' rejected the request; retrying at normal speed")
+                try:
+                    sliced = self._synthesize_marked(ssml, len(chunk), language_code,
+                                                     voice_name, 1.0)
+                    self.voice_caps.record(voice_name, False)
+                    api_rate, post_tempo, rejected = 1.0, SPEAKING_RATE, None
+                except google_exceptions.InvalidArgument as e:
+                    rejected = e
+            if sliced is None:
+                # Not a speaking_rate problem: the voice may not take SSML/<mark>s,
+                # or one sentence alone is over the byte limit.
+                reason = (f"rejected the packed request ({rejected})" if rejected
+                          else "returned no SSML mark timepoints")
+                print(f"  ⚠ '{voice_name}' {reason}; "
+                      f"synthesizing {len(chunk)} sentences one by one")
+                for text in chunk:
+                    clips[text] = self._synthesize_speech(text, language_code, voice_name)
+                continue
+            for text, clip in zip(chunk, sliced):
+                slowed = _slow_audio(clip, post_tempo)
+                if post_tempo == 1.0 or slowed is not clip:
+                    self.clip_cache.put(cache_key(text), slowed)
+                clips[text] = slowed
+        return [clips[t] for t in texts]
+
     def _level_guidance(self, level):
         """Validate a CEFR level and return (level_upper, guidance_text) or (None, None)."""
         level = level.upper()
@@ -209,19 +1493,60 @@ class GermanAudioGenerator:
             return None, None
         return level, LEVEL_GUIDANCE[level]
 
+    @property
+    def tts_client(self):
+        """The TTS client, created on first use (list/export-db never need one)."""
+        with self._lock:
+            if self._tts_client is None:
+                if FAKE_TTS:
+                    self._tts_client = FakeTTSClient()
+                else:
+                    from google.cloud import texttospeech
+                    self._tts_client = texttospeech.TextToSpeechClient()
+            return self._tts_client
+
+    @property
+    def anthropic_client(self):
+        """One long-lived Anthropic client per generator (keeps its connection pool)."""
+        with self._lock:
+            if self._anthropic is None:
+                import anthropic
+                self._anthropic = anthropic.Anthropic(
+                    api_key=os.environ.get("ANTHROPIC_API_KEY"))
+            return self._anthropic
+
     def _ask_claude_json(self, prompt, max_tokens=2000):
-        """Send a prompt to Claude and parse its reply as a JSON array."""
-        client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-        message = client.messages.create(
+        """Send a prompt to Claude and parse its reply as a JSON array.
+
+        Replies are cached on disk by (model, prompt, max_tokens); only replies
+        that parse are cached.
+        """
+        cache_key = DiskCache.make_key(MODEL, prompt, max_tokens)
+        cached = self.llm_cache.get(cache_key) if self.use_cache else None
+        if cached is not None:
+            return self._parse_json_text(cached.decode("utf-8"))
+        message = self.anthropic_client.messages.create(
             model=MODEL,
             max_tokens=max_tokens,
             messages=[{"role": "user", "content": prompt}]
         )
+        response_text = self._reply_text(message)
+        parsed = self._parse_json_text(response_text)
+        self.llm_cache.put(cache_key, response_text.encode("utf-8"))
+        return parsed
+
+    @staticmethod
+    def _reply_text(message):
+        """Join a Claude message's text blocks."""
         # Skip any non-text blocks (e.g. extended-thinking blocks) and join the text.
-        response_text = "".join(
+        return "".join(
             block.text for block in message.content
             if getattr(block, "type", None) == "text"
         ).strip()
+
+    @staticmethod
+    def _parse_json_text(response_text):
+        """Parse a Claude reply as JSON (tolerating a ```json fence)."""
         # Remove markdown code blocks if present
         if response_text.startswith("```"):
             response_text = response_text.split("```")[1]
@@ -258,8 +1583,8 @@ Return ONLY the JSON array, no other text."""
 
         sentence_pairs = self._ask_claude_json(prompt)
 
-        # Load existing sentences and add new ones
-        sentences = self._load_sentences()
+        # Collect the new entries and upsert them in one write
+        new_entries = {}
 
         for pair in sentence_pairs:
             # Create filename from English sentence
@@ -272,19 +1597,20 @@ Return ONLY the JSON array, no other text."""
             }
             if level:
                 entry["level"] = level
-            sentences[filename] = entry
+            new_entries[filename] = entry
         
-        self._save_sentences(sentences)
+        self.store.upsert_many(new_entries)
         print(f"✓ Generated {len(sentence_pairs)} new sentence pairs")
-        print(f"✓ Total sentences in database: {len(sentences)}")
+        print(f"✓ Total sentences in database: {self.store.count()}")
         return sentence_pairs
 
-    def _load_wordlist(self, level=None):
+    def _load_wordlist(self, level=None, limit=None):
         """Load the Goethe A1-B1 wordlist (word/example/translation, tagged by level).
 
         Pass a CEFR level (A1/A2/B1) to return only that level's words. Entries are
-        returned most-common-first (by corpus frequency rank), so callers can take a
-        prefix to prioritize the most important words.
+        returned most-common-first (by corpus frequency rank), so a `limit` returns
+        the most important words; it is served from the compiled WordlistIndex,
+        so only those rows are parsed.
         """
         if not WORDLIST_FILE.exists():
             print(f"✗ Wordlist not found: {WORDLIST_FILE}")
@@ -293,75 +1619,207 @@ Return ONLY the JSON array, no other text."""
         if want and want not in CEFR_LEVELS:
             print(f"✗ Unknown level '{want}'. Use one of: {', '.join(CEFR_LEVELS)}")
             return []
-        entries = []
-        with open(WORDLIST_FILE, encoding="utf-8") as f:
-            next(f, None)  # skip the header row
-            for line in f:
-                line = line.rstrip("\n")
-                if not line.strip():
-                    continue
-                parts = line.split("\t")
-                if len(parts) < 4:
-                    continue
-                lvl, word, german, english = parts[0], parts[1], parts[2], parts[3]
-                try:
-                    freq_rank = int(parts[4]) if len(parts) > 4 else NO_FREQ_RANK
-                except ValueError:
-                    freq_rank = NO_FREQ_RANK
-                if want and lvl != want:
-                    continue
-                entries.append({"level": lvl, "word": word, "german": german,
-                                "english": english, "freq_rank": freq_rank})
-        # Most common first; ties (and unranked words) keep file/alphabetical order.
-        entries.sort(key=lambda e: e["freq_rank"])
-        return entries
+        return WordlistIndex(WORDLIST_FILE, WORDLIST_INDEX,
+                             CACHE_DIR / WORDLIST_INDEX.name).top(want, limit)
 
-    def import_wordlist(self, level=None, limit=None):
+    def import_wordlist(self, level=None, limit=None, on_entry=None):
         """Import Goethe wordlist example sentences into the sentence database.
 
         Each word's official example sentence becomes a to-be-spoken entry tagged
         with its CEFR level. Words are taken most-common-first, so passing a limit
         imports the highest-frequency (most important) words for the scope. Existing
         entries with the same key are left untouched, so this is safe to re-run.
+        Each new entry is passed to on_entry(key, entry) once saved.
         """
-        entries = self._load_wordlist(level)
+        entries = self._load_wordlist(level, limit)
         if not entries:
             print("No wordlist entries to import.")
             return
 
-        if limit is not None:
-            entries = entries[:limit]
-
-        sentences = self._load_sentences()
-        added = 0
-        for e in entries:
-            base = f"{e['level'].lower()}_{_slugify(e['word'])}"
-            key, i = base, 2
-            # Give distinct senses of the same word distinct keys.
-            while key in sentences and sentences[key].get("german") != e["german"]:
-                key = f"{base}_{i}"
-                i += 1
-            if key in sentences:
-                continue  # already imported this exact sentence
-            sentences[key] = {
-                "german": e["german"],
-                "english": e["english"],
-                "word": e["word"],
-                "level": e["level"],
-                "freq_rank": e["freq_rank"],
-                "source": "goethe-wortliste",
-                "audio_generated": False,
-            }
-            added += 1
+        # Allocate keys against the stored entries and save them under one lock,
+        # so a concurrent import or generation can't take the same keys.
+        with self.store.locked():
+            sentences = self.store.all()
+            new_entries = {}
+            for e in entries:
+                base = f"{e['level'].lower()}_{_slugify(e['word'])}"
+                key, i = base, 2
+                # Give distinct senses of the same word distinct keys.
+                while key in sentences and sentences[key].get("german") != e["german"]:
+                    key = f"{base}_{i}"
+                    i += 1
+                if key in sentences:
+                    continue  # already imported this exact sentence
+                sentences[key] = {
+                    "german": e["german"],
+                    "english": e["english"],
+                    "word": e["word"],
+                    "level": e["level"],
+                    "freq_rank": e["freq_rank"],
+                    "source": "goethe-wortliste",
+                    "audio_generated": False,
+                }
+                new_entries[key] = sentences[key]
 
-        self._save_sentences(sentences)
+            self.store.upsert_many(new_entries)
+        if on_entry:
+            for key, entry in new_entries.items():
+                on_entry(key, entry)
+        added = len(new_entries)
         scope = level.upper() if level else "A1-B1"
         limit_msg = f", top {limit} by frequency" if limit is not None else ""
         print(f"✓ Imported {added} new sentences from Goethe wordlist ({scope}{limit_msg})")
         print(f"✓ Total sentences in database: {len(sentences)}")
         return added
 
-    def generate_for_words(self, level, words=None, count=None, batch_size=15):
+    def _word_batch_prompt(self, level, guidance, batch):
+        """Build the generate-words prompt for one batch of target words."""
+        word_lines = "\n".join(f"- {w}" for w in batch)
+        return f"""Write ONE natural, spoken German example sentence for EACH German word below, suitable for a CEFR {level} learner.
+
+{guidance}
+Every other word in each sentence must also be {level}-appropriate — stay strictly within what a {level} learner understands.
+
+Words:
+{word_lines}
+
+For each word return an object with:
+- "word": the target word exactly as given
+- "german": the example sentence (it must actually use the word)
+- "english": an English translation of the sentence
+
+Return ONLY a JSON array of these objects, one per word, no other text."""
+
+    def _add_generated(self, sentences, level, pairs, rank_of):
+        """Turn Claude's {word, german, english} objects into new DB entries.
+
+        Updates `sentences` in place (so later keys see earlier ones) and returns
+        {key: entry} for just the entries added.
+        """
+        added = {}
+        for pair in pairs:
+            word = (pair.get("word") or "").strip()
+            german = (pair.get("german") or "").strip()
+            english = (pair.get("english") or "").strip()
+            if not (word and german and english):
+                continue
+            key_base = f"{level.lower()}_gen_{_slugify(word)}"
+            key, i = key_base, 2
+            # Distinct sentences for the same word coexist (accumulate variants).
+            while key in sentences and sentences[key].get("german") != german:
+                key = f"{key_base}_{i}"
+                i += 1
+            entry = {
+                "german": german,
+                "english": english,
+                "word": word,
+                "level": level,
+                "source": "generated",
+                "audio_generated": False,
+            }
+            if rank_of.get(word) is not None:
+                entry["freq_rank"] = rank_of[word]
+            sentences[key] = added[key] = entry
+        return added
+
+    def _stream_claude_json(self, prompt, max_tokens=4000):
+        """Stream a Claude reply, yielding each JSON array element once complete.
+
+        Shares the reply cache with _ask_claude_json: a cached reply is replayed,
+        and a complete streamed reply is cached. If the reply is cut off (e.g.
+        at max_tokens), the objects that did arrive have already been yielded.
+        The generator returns True for a complete reply, False for a cut-off or
+        malformed one.
+        """
+        cache_key = DiskCache.make_key(MODEL, prompt, max_tokens)
+        cached = self.llm_cache.get(cache_key) if self.use_cache else None
+        if cached is not None:
+            yield from self._parse_json_text(cached.decode("utf-8"))
+            return True
+        parser = JsonArrayStream()
+        chunks = []
+        with self.anthropic_client.messages.stream(
+            model=MODEL,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+                yield from parser.feed(text)
+            stop_reason = stream.get_final_message().stop_reason
+        if stop_reason == "max_tokens":
+            print("  ⚠ Reply truncated at max_tokens; kept the complete entries")
+            return False
+        response_text = "".join(chunks).strip()
+        try:
+            self._parse_json_text(response_text)
+        except ValueError:
+            return False  # don't cache a reply that doesn't parse as a whole
+        self.llm_cache.put(cache_key, response_text.encode("utf-8"))
+        return True
+
+    def _stream_word_batch(self, level, guidance, batch, label, on_pair):
+        """Stream one word batch, calling on_pair(obj) as each entry arrives.
+
+        Failed or truncated streams are retried for just the words that haven't
+        arrived yet, so nothing already saved is generated twice. Words are
+        matched the way keys are made (_slugify), so a reply that spells one
+        "hund" or "Hund!" still counts for "Hund". A complete reply that skips
+        words isn't retried: asking again would mostly repeat the same answer.
+        """
+        remaining = {_slugify(word): word for word in batch}
+        for attempt in range(LLM_BATCH_RETRIES + 1):
+            prompt = self._word_batch_prompt(level, guidance, list(remaining.values()))
+            replies = self._stream_claude_json(prompt)
+            try:
+                while True:
+                    try:
+                        obj = next(replies)
+                    except StopIteration as stop:
+                        complete = stop.value
+                        break
+                    remaining.pop(_slugify(obj.get("word") or ""), None)
+                    on_pair(obj)
+                if not remaining:
+                    return
+                if complete:
+                    print(f"  ⚠ {label}: no sentence for {', '.join(remaining.values())}")
+                    return
+                error = f"{len(remaining)} words missing from the reply"
+            except Exception as e:
+                error = e
+            if attempt == LLM_BATCH_RETRIES:
+                print(f"  ⚠ {label} failed ({error}); giving up on {len(remaining)} words")
+                return
+            wait = 2 ** attempt * (1 + random.random())
+            print(f"  ⚠ {label} failed ({error}); retrying in {wait:.1f}s")
+            time.sleep(wait)
+
+    def _ask_with_retries(self, prompt, label, max_tokens=4000):
+        """_ask_claude_json, retried with backoff; returns None once retries run out."""
+        for attempt in range(LLM_BATCH_RETRIES + 1):
+            try:
+                return self._ask_claude_json(prompt, max_tokens=max_tokens)
+            except Exception as e:
+                if attempt == LLM_BATCH_RETRIES:
+                    print(f"  ⚠ {label} failed ({e}); giving up after "
+                          f"{LLM_BATCH_RETRIES + 1} attempts")
+                    return None
+                wait = 2 ** attempt * (1 + random.random())
+                print(f"  ⚠ {label} failed ({e}); retrying in {wait:.1f}s")
+                time.sleep(wait)
+
+    def _resolve_words(self, level, words=None, count=None):
+        """Target words for generate-words, plus {word: freq_rank} when known."""
+        rank_of = {}
+        if words is None:
+            entries = self._load_wordlist(level, count or 10)
+            words = [e["word"] for e in entries]
+            rank_of = {e["word"]: e["freq_rank"] for e in entries}
+        return [w for w in words if w.strip()], rank_of
+
+    def generate_for_words(self, level, words=None, count=None, batch_size=15,
+                           concurrency=LLM_CONCURRENCY, stream=False, on_entry=None):
         """Generate a fresh, level-appropriate example sentence for each target word.
 
         Unlike import-wordlist (which reuses Goethe's canned example), this asks
@@ -369,157 +1827,629 @@ Return ONLY the JSON array, no other text."""
         Provide an explicit `words` list, or a `count` to pull that many of the most
         common words for the level from the Goethe wordlist. Generated entries use a
         distinct key prefix so they never overwrite imported ones.
+
+        Word batches are sent up to `concurrency` at a time, each retried on its
+        own; results are merged in batch order so keys are deterministic.
+
+        With stream=True, replies are streamed and each entry is saved the moment
+        it is complete (and passed to on_entry(key, entry), e.g. to queue its
+        audio), so a truncated or failed reply loses nothing already received.
+        Keys then follow arrival order.
         """
         level, guidance = self._level_guidance(level)
         if level is None:
             return []
 
         # Resolve target words; remember frequency rank when we know it.
-        rank_of = {}
-        if words is None:
-            entries = self._load_wordlist(level)[:(count or 10)]
-            words = [e["word"] for e in entries]
-            rank_of = {e["word"]: e["freq_rank"] for e in entries}
-        words = [w for w in words if w.strip()]
+        words, rank_of = self._resolve_words(level, words, count)
         if not words:
             print("No target words to generate for.")
             return []
 
+        if stream:
+            return self._generate_streaming(level, guidance, words, rank_of,
+                                            batch_size, concurrency, on_entry)
+
         print(f"Generating fresh {level} sentences for {len(words)} words...")
-        sentences = self._load_sentences()
+        batches = [words[i:i + batch_size] for i in range(0, len(words), batch_size)]
+        results = [None] * len(batches)
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {
+                pool.submit(self._ask_with_retries,
+                            self._word_batch_prompt(level, guidance, batch),
+                            f"Batch {n + 1}"): n
+                for n, batch in enumerate(batches)
+            }
+            words_done = 0
+            for future in as_completed(futures):
+                n = futures[future]
+                results[n] = future.result() or []
+                words_done += len(batches[n])
+                print(f"  ✓ {words_done}/{len(words)} words requested...")
+
+        with self.store.locked():  # see import_wordlist
+            sentences = self.store.all()
+            new_entries = {}
+            for pairs in results:
+                new_entries.update(self._add_generated(sentences, level, pairs, rank_of))
+            self.store.upsert_many(new_entries)
+        generated = [e["word"] for e in new_entries.values()]
+        print(f"✓ Generated {len(generated)} fresh {level} sentences")
+        print(f"✓ Total sentences in database: {len(sentences)}")
+        return generated
+
+    def _generate_streaming(self, level, guidance, words, rank_of, batch_size,
+                            concurrency, on_entry=None):
+        """Streaming half of generate_for_words: save entries as they arrive."""
+        print(f"Streaming fresh {level} sentences for {len(words)} words...")
+        batches = [words[i:i + batch_size] for i in range(0, len(words), batch_size)]
         generated = []
-        for start in range(0, len(words), batch_size):
-            batch = words[start:start + batch_size]
-            word_lines = "\n".join(f"- {w}" for w in batch)
-            prompt = f"""Write ONE natural, spoken German example sentence for EACH German word below, suitable for a CEFR {level} learner.
 
-{guidance}
-Every other word in each sentence must also be {level}-appropriate — stay strictly within what a {level} learner understands.
+        def on_pair(obj):
+            # Re-read under the store lock: other processes may have added keys
+            # since the last pair.
+            with self._lock, self.store.locked():
+                added = self._add_generated(self.store.all(), level, [obj], rank_of)
+                self.store.upsert_many(added)
+                generated.extend(e["word"] for e in added.values())
+            for key, entry in added.items():
+                print(f"  ✓ [{len(generated)}/{len(words)}] {key}: {entry['german']}")
+                if on_entry:
+                    on_entry(key, entry)
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            list(pool.map(lambda nb: self._stream_word_batch(
+                level, guidance, nb[1], f"Batch {nb[0] + 1}", on_pair),
+                enumerate(batches)))
 
-Words:
-{word_lines}
+        print(f"✓ Generated {len(generated)} fresh {level} sentences")
+        print(f"✓ Total sentences in database: {self.store.count()}")
+        return generated
 
-For each word return an object with:
-- "word": the target word exactly as given
-- "german": the example sentence (it must actually use the word)
-- "english": an English translation of the sentence
+    def _load_batch_state(self):
+        try:
+            return json.loads(MESSAGE_BATCH_STATE.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return []
 
-Return ONLY a JSON array of these objects, one per word, no other text."""
+    def _save_batch_state(self, state):
+        if not state:
+            MESSAGE_BATCH_STATE.unlink(missing_ok=True)
+            return
+        _atomic_write_text(MESSAGE_BATCH_STATE, json.dumps(state, indent=2, ensure_ascii=False))
+
+    def generate_for_words_batch(self, level=None, words=None, count=None, batch_size=15):
+        """Like generate_for_words, but via the asynchronous Message Batches API.
+
+        Every word batch becomes one request in a single message batch. The batch
+        ID is persisted (MESSAGE_BATCH_STATE) before polling starts, so if this
+        process dies, running the command again resumes the pending batch instead
+        of submitting a new one. Resuming needs no level (the state records it).
+        """
+        if self._load_batch_state():
+            print("Resuming pending message batches (not submitting new words)...")
+            return self.resume_message_batches()
+        if level is None:
+            print("✗ No pending message batches to resume; pass a level to submit one")
+            return []
+
+        level, guidance = self._level_guidance(level)
+        if level is None:
+            return []
+        words, rank_of = self._resolve_words(level, words, count)
+        if not words:
+            print("No target words to generate for.")
+            return []
+
+        batches = [words[i:i + batch_size] for i in range(0, len(words), batch_size)]
+        requests = [{
+            "custom_id": f"words-{n}",
+            "params": {
+                "model": MODEL,
+                "max_tokens": 4000,
+                "messages": [{"role": "user",
+                              "content": self._word_batch_prompt(level, guidance, batch)}],
+            },
+        } for n, batch in enumerate(batches)]
+        submitted = self.anthropic_client.messages.batches.create(requests=requests)
+        self._save_batch_state([{
+            "id": submitted.id,
+            "level": level,
+            "submitted": int(time.time()),
+            "words": {f"words-{n}": batch for n, batch in enumerate(batches)},
+            "rank_of": rank_of,
+            "merged": [],
+        }])
+        print(f"✓ Submitted message batch {submitted.id} "
+              f"({len(requests)} requests, {len(words)} {level} words)")
+        return self.resume_message_batches()
+
+    def resume_message_batches(self):
+        """Poll every pending message batch until it ends, merging results as read.
+
+        Each request's entries are written to the DB as soon as its result is
+        read, and recorded as merged in the state file, so a crash mid-way never
+        merges a result twice. Requests that errored or expired are retried
+        synchronously.
+        """
+        generated = []
+        for job in self._load_batch_state():
+            client = self.anthropic_client
+            while True:
+                batch = client.messages.batches.retrieve(job["id"])
+                counts = batch.request_counts
+                print(f"  {job['id']}: {batch.processing_status} — "
+                      f"{counts.succeeded} succeeded, {counts.errored} errored, "
+                      f"{counts.processing} processing")
+                if batch.processing_status == "ended":
+                    break
+                time.sleep(MESSAGE_BATCH_POLL_SECONDS)
+
+            level = job["level"]
+            guidance = LEVEL_GUIDANCE[level]
+            for result in client.messages.batches.results(job["id"]):
+                custom_id = result.custom_id
+                if custom_id in job["merged"]:
+                    continue
+                if result.result.type == "succeeded":
+                    try:
+                        text = self._reply_text(result.result.message)
+                        pairs = self._parse_json_text(text)
+                        # Cache it like a synchronous reply, so re-runs replay it.
+                        prompt = self._word_batch_prompt(level, guidance,
+                                                         job["words"][custom_id])
+                        self.llm_cache.put(DiskCache.make_key(MODEL, prompt, 4000),
+                                           text.encode("utf-8"))
+                    except ValueError as e:
+                        print(f"  ⚠ {custom_id}: unparseable reply ({e}); retrying directly")
+                        pairs = None
+                else:
+                    print(f"  ⚠ {custom_id}: {result.result.type}; retrying directly")
+                    pairs = None
+                if pairs is None:
+                    prompt = self._word_batch_prompt(level, guidance, job["words"][custom_id])
+                    pairs = self._ask_with_retries(prompt, custom_id) or []
+                with self.store.locked():  # see import_wordlist
+                    added = self._add_generated(self.store.all(), level, pairs,
+                                                job["rank_of"])
+                    self.store.upsert_many(added)
+                generated.extend(e["word"] for e in added.values())
+                job["merged"].append(custom_id)
+                self._save_batch_state([job if j["id"] == job["id"] else j
+                                        for j in self._load_batch_state()])
+                print(f"  ✓ {custom_id}: {len(added)} sentences saved")
+
+            self._save_batch_state([j for j in self._load_batch_state()
+                                    if j["id"] != job["id"]])
+            print(f"✓ Message batch {job['id']} complete")
+
+        print(f"✓ Generated {len(generated)} fresh sentences")
+        print(f"✓ Total sentences in database: {self.store.count()}")
+        return generated
 
+    def _synthesize_pair(self, pair):
+        """Synthesize a sentence pair's German and English audio."""
+        german_audio = self._synthesize_speech(pair['german'], "de-DE", GERMAN_VOICE)
+        english_audio = self._synthesize_speech(pair['english'], "en-US", ENGLISH_VOICE)
+        return german_audio, english_audio
+
+    def _synthesize_pairs(self, keys, batch=False, entries=None):
+        """Synthesize several DB entries; returns [(key, entry, german_audio, english_audio)].
+
+        With batch=True, all German texts go out as packed SSML requests, and
+        likewise all English texts (see _synthesize_batch). Entries are taken
+        from `entries` ({key: entry}) when it has them, else read from the store.
+        """
+        entries = [(entries or {}).get(k) or self.store.get(k) for k in keys]
+        if not batch:
+            return [(k, e, *self._synthesize_pair(e)) for k, e in zip(keys, entries)]
+        german = self._synthesize_batch([e['german'] for e in entries], "de-DE", GERMAN_VOICE)
+        english = self._synthesize_batch([e['english'] for e in entries], "en-US", ENGLISH_VOICE)
+        return list(zip(keys, entries, german, english))
+
+    def _render_pipeline(self, keys, workers, encoders, on_done, batch=False, entries=None):
+        """Render keys as a two-stage pipeline: synthesis threads -> encoder processes.
+
+        `workers` threads do the network-bound synthesis and push byte pairs onto
+        a bounded queue; the main thread hands them to a pool of `encoders`
+        processes for the CPU-bound mix + AAC encode. A full queue blocks the
+        synthesis threads, and at most 2*encoders encodes are in flight, so
+        memory stays flat however many keys there are. on_done(key, error) is
+        called once per key as it finishes (error is None on success).
+        With batch=True each synthesis task covers TTS_BATCH_SENTENCES keys
+        using packed SSML requests. `entries` is passed to _synthesize_pairs.
+        """
+        finished = object()
+        pairs = queue.Queue(maxsize=encoders * 2)
+        in_flight = threading.BoundedSemaphore(encoders * 2)
+
+        group_size = TTS_BATCH_SENTENCES if batch else 1
+        groups = [keys[i:i + group_size] for i in range(0, len(keys), group_size)]
+
+        def synthesize(group):
             try:
-                pairs = self._ask_claude_json(prompt, max_tokens=4000)
+                results = self._synthesize_pairs(group, batch, entries)
             except Exception as e:
-                print(f"  ⚠ Batch {start // batch_size + 1} failed ({e}); skipping")
-                continue
-
-            for pair in pairs:
-                word = (pair.get("word") or "").strip()
-                german = (pair.get("german") or "").strip()
-                english = (pair.get("english") or "").strip()
-                if not (word and german and english):
+                for key in group:
+                    pairs.put((key, None, None, None, e))
+                return
+            for key, entry, german_audio, english_audio in results:
+                pairs.put((key, entry, german_audio, english_audio, None))
+
+        def produce():
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(synthesize, groups))
+            pairs.put(finished)
+
+        def encoded(key, entry, future):
+            in_flight.release()
+            error = future.exception()
+            if error is None:
+                self._rendered(key, entry, "pcm" if batch else TTS_ENCODING)
+            on_done(key, error)
+
+        threading.Thread(target=produce, daemon=True).start()
+        from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+        with ProcessPoolExecutor(max_workers=encoders) as pool:
+            while (item := pairs.get()) is not finished:
+                key, entry, german_audio, english_audio, error = item
+                if error is not None:
+                    on_done(key, error)
                     continue
-                key_base = f"{level.lower()}_gen_{_slugify(word)}"
-                key, i = key_base, 2
-                # Distinct sentences for the same word coexist (accumulate variants).
-                while key in sentences and sentences[key].get("german") != german:
-                    key = f"{key_base}_{i}"
-                    i += 1
-                entry = {
-                    "german": german,
-                    "english": english,
-                    "word": word,
-                    "level": level,
-                    "source": "generated",
-                    "audio_generated": False,
-                }
-                if rank_of.get(word) is not None:
-                    entry["freq_rank"] = rank_of[word]
-                sentences[key] = entry
-                generated.append(word)
-            print(f"  ✓ {len(generated)}/{len(words)} done...")
+                in_flight.acquire()
+                future = pool.submit(_encode_clip, german_audio, english_audio,
+                                     self.audio_dir / f"{key}.m4a")
+                future.add_done_callback(
+                    lambda f, key=key, entry=entry: encoded(key, entry, f))
 
-        self._save_sentences(sentences)
-        print(f"✓ Generated {len(generated)} fresh {level} sentences")
-        print(f"✓ Total sentences in database: {len(sentences)}")
-        return generated
+    def _post_slowed(self):
+        """Whether clips are slowed in post-processing rather than by the API."""
+        return FORCE_POST_SLOWDOWN or any(self.voice_caps.supports_rate(voice) is False
+                                          for voice in (GERMAN_VOICE, ENGLISH_VOICE))
 
-    def create_audio(self, filename_key):
-        """Create audio file for a specific sentence pair"""
-        sentences = self._load_sentences()
+    def _rendered(self, key, entry, encoding=TTS_ENCODING):
+        """Journal a finished clip; fold the journal into the DB every so often.
+
+        `encoding` is the one its speech was synthesized in.
+        """
+        self.journal.append(key, _audio_fingerprint(entry, encoding, self._post_slowed()))
+        with self._lock:
+            self._journaled += 1
+            flush = self._journaled % RENDER_JOURNAL_FLUSH_EVERY == 0
+        if flush:
+            self._commit_journal()
+
+    def _commit_journal(self):
+        """Mark every journaled key whose audio file exists as generated."""
+        def apply(entries):
+            self.store.update_each({
+                key: {"audio_generated": True, "audio_fingerprint": fingerprint}
+                for key, fingerprint in entries.items()
+                if (self.audio_dir / f"{key}.m4a").exists()})
+        return self.journal.commit(apply)
+
+    def _reconcile_rendered(self):
+        """Bring the database up to date with what earlier runs left behind.
+
+        Applies any journal an interrupted run left behind: those keys are the
+        clips known to have been rendered from their entry's current text. A
+        .m4a that exists without a journal line is not adopted, since nothing
+        ties it to the entry as it is now (the text may have been replaced, or
+        the flag reset to force a re-render); re-rendering it is served from the
+        clip cache, so it costs an encode, not a synthesis. Entries rendered
+        before fingerprints existed are stamped with the current one, and stale
+        partial encodes are removed. Returns the up-to-date {key: entry} dict.
+        """
+        recovered = self._commit_journal()
+        if recovered:
+            print(f"✓ Resuming: {recovered} clips were already rendered by an earlier run")
+        sentences = self.store.all()
+        post_slowed = self._post_slowed()
+        updates = {key: {"audio_fingerprint": _audio_fingerprint(entry, post_slowed=post_slowed)}
+                   for key, entry in sentences.items()
+                   if entry.get("audio_generated", False) and "audio_fingerprint" not in entry}
+        if updates:
+            self.store.update_each(updates)
+            for key, fields in updates.items():
+                sentences[key].update(fields)
+        cutoff = time.time() - 3600  # older than any encode still in progress
+        for partial in self.audio_dir.glob(".*.part"):
+            try:
+                if partial.stat().st_mtime < cutoff:
+                    partial.unlink()
+            except FileNotFoundError:
+                pass
+        return sentences
+
+    def create_audio(self, filename_key, quiet=False, journal=False, entry=None):
+        """Create audio file for a specific sentence pair.
+
+        With journal=True (create-all) completion goes to the render journal
+        instead of an immediate database write. Callers that already hold the
+        entry pass it as `entry`, sparing a database read.
+        """
+        pair = entry if entry is not None else self.store.get(filename_key)
         
-        if filename_key not in sentences:
+        if pair is None:
             print(f"✗ Sentence '{filename_key}' not found in database")
             return False
         
-        pair = sentences[filename_key]
-        german_text = pair['german']
-        english_text = pair['english']
-        
-        print(f"Creating audio for: {english_text}")
-        
-        # Generate German audio
-        german_audio = self._synthesize_speech(german_text, "de-DE", GERMAN_VOICE)
+        if not quiet:
+            print(f"Creating audio for: {pair['english']}")
         
-        # Generate English audio
-        english_audio = self._synthesize_speech(english_text, "en-US", ENGLISH_VOICE)
-        
-        # Save temporary files
-        temp_german = self.audio_dir / "temp_german.mp3"
-        temp_english = self.audio_dir / "temp_english.mp3"
-        
-        with open(temp_german, 'wb') as f:
-            f.write(german_audio)
-        with open(temp_english, 'wb') as f:
-            f.write(english_audio)
-        
-        # Combine with 1 second pause between
-        german_segment = AudioSegment.from_mp3(temp_german)
-        english_segment = AudioSegment.from_mp3(temp_english)
-        silence = AudioSegment.silent(duration=1000)  # 1 second
-        
-        combined = german_segment + silence + english_segment
-        
-        # Export final file using AAC (mp3 encoder not available in your ffmpeg)
-        output_file = self.audio_dir / f"{filename_key}.m4a"
-        combined.export(output_file, format="ipod", codec="aac", bitrate="128k")
-        
-        # Clean up temp files
-        temp_german.unlink()
-        temp_english.unlink()
+        german_audio, english_audio = self._synthesize_pair(pair)
+        output_file = _encode_clip(german_audio, english_audio,
+                                   self.audio_dir / f"{filename_key}.m4a")
         
         # Update database
-        sentences[filename_key]['audio_generated'] = True
-        self._save_sentences(sentences)
+        if journal:
+            self._rendered(filename_key, pair)
+        else:
+            self.store.update(filename_key, audio_generated=True,
+                              audio_fingerprint=_audio_fingerprint(
+                                  pair, post_slowed=self._post_slowed()))
         
         print(f"✓ Created: {output_file}")
         return True
     
-    def create_all_audio(self, level=None):
+    def create_all_audio(self, level=None, workers=1, encoders=0, batch=False,
+                         shard=None, lease=False):
         """Generate audio for all sentences that don't have it yet.
 
         Pass a CEFR level (A1/A2/B1) to only process sentences tagged with it —
         useful for working through the imported wordlist one level at a time.
+        With workers > 1, clips are synthesized concurrently on a thread pool;
+        all workers share one token bucket so the TTS per-minute quota holds.
+        With encoders > 0, mixing/encoding moves to that many processes and runs
+        alongside synthesis (see _render_pipeline). batch=True packs sentences
+        into multi-sentence SSML requests (and implies at least one encoder).
+
+        To split the work between processes or hosts sharing the data and output
+        dirs, pass shard=(i, n) to take only keys with crc32(key) % n == i, or
+        lease=True to claim pending keys in chunks from a shared LeaseBook.
+
+        Safe to interrupt: finished clips are journaled as they land and an
+        interrupted run is picked up where it stopped (see _reconcile_rendered).
+        Entries whose audio was rendered with other voices, rate, pause or text
+        (see _audio_fingerprint) are rendered again.
         """
-        sentences = self._load_sentences()
+        sentences = self._reconcile_rendered()
         want = level.upper() if level else None
+        post_slowed = self._post_slowed()
         pending = [k for k, v in sentences.items()
-                   if not v.get('audio_generated', False)
-                   and (want is None or v.get('level') == want)]
+                   if _needs_audio(v, post_slowed) and (want is None or v.get('level') == want)]
+        if shard is not None:
+            index, count = shard
+            pending = [k for k in pending
+                       if zlib.crc32(k.encode("utf-8")) % count == index]
+        stale = sum(1 for k in pending if sentences[k].get('audio_generated'))
 
         scope = f" ({want})" if want else ""
+        if shard is not None:
+            scope += f" [shard {shard[0]}/{shard[1]}]"
         print(f"Generating audio for {len(pending)} sentences{scope}...")
-        
-        for i, filename_key in enumerate(pending, 1):
-            print(f"\n[{i}/{len(pending)}]", end=" ")
-            self.create_audio(filename_key)
-        
-        print(f"\n✓ Complete! All audio files generated.")
-    
-    def test_voice(self, german_text=None):
+        if stale:
+            print(f"  ({stale} of them re-rendered: text or audio settings changed)")
+        started = time.monotonic()
+        calls_before = self.tts_calls
+        if batch:
+            encoders = max(encoders, 1)
+        if encoders > 0:
+            print(f"Using {workers} synthesis workers and {encoders} encoder processes "
+                  f"(≤ {TTS_REQUESTS_PER_MINUTE} TTS requests/min)")
+        elif workers > 1:
+            print(f"Using {workers} concurrent workers "
+                  f"(≤ {TTS_REQUESTS_PER_MINUTE} TTS requests/min)")
+
+        try:
+            if lease:
+                done, failed = self._render_leased(
+                    {k: _audio_fingerprint(sentences[k], "pcm" if batch else TTS_ENCODING,
+                                           post_slowed) for k in pending},
+                    workers, encoders, batch, sentences)
+            else:
+                failed = self._render_keys(pending, workers, encoders, batch, sentences)
+                done = len(pending) - failed
+        finally:
+            self._commit_journal()  # fold finished clips into the DB, even on Ctrl-C
+
+        elapsed = time.monotonic() - started
+        print(f"\n✓ Complete! {done} audio files generated"
+              + (f", {failed} failed" if failed else "") + ".")
+        if done and elapsed > 0:
+            print(f"  Throughput: {done / elapsed * 60:.1f} clips/min over {elapsed:.1f}s "
+                  f"({self.tts_calls - calls_before} TTS requests)")
+        print(f"  Clip cache: {self.clip_cache.stats()}")
+
+    def _render_keys(self, keys, workers, encoders, batch, entries=None):
+        """Render keys with the configured concurrency; returns the number that failed.
+
+        `entries` ({key: entry}, e.g. create-all's snapshot) saves looking each
+        key up in the store again.
+        """
+        entries = entries or {}
+        failed = 0
+        if encoders > 0:
+            finished = 0
+
+            def on_done(key, error):
+                nonlocal failed, finished
+                with self._lock:
+                    finished += 1
+                    if error is not None:
+                        failed += 1
+                        print(f"  ✗ {key} failed: {error}")
+                    if finished % 25 == 0 or finished == len(keys):
+                        print(f"  [{finished}/{len(keys)}] done...")
+
+            self._render_pipeline(keys, max(1, workers), encoders, on_done, batch, entries)
+        elif workers <= 1:
+            for i, filename_key in enumerate(keys, 1):
+                print(f"\n[{i}/{len(keys)}]", end=" ")
+                self.create_audio(filename_key, journal=True, entry=entries.get(filename_key))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(self.create_audio, k, quiet=True, journal=True,
+                                       entry=entries.get(k)): k
+                           for k in keys}
+                for i, future in enumerate(as_completed(futures), 1):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failed += 1
+                        print(f"  ✗ {futures[future]} failed: {e}")
+                    if i % 25 == 0 or i == len(keys):
+                        print(f"  [{i}/{len(keys)}] done...")
+        return failed
+
+    def _render_leased(self, pending, workers, encoders, batch, entries=None):
+        """Claim chunks of the pending {key: fingerprint} from the lease book and
+        render them until none are left.
+
+        Keys another worker holds an unexpired lease on, or has already rendered
+        at the same fingerprint, are skipped; both checks happen under the lease
+        lock. While other workers still hold leases on pending keys this worker
+        waits (re-checking every RENDER_LEASE_POLL_SECONDS) rather than exiting,
+        so a dead worker's leases, which lapse after RENDER_LEASE_SECONDS, are
+        claimed again in the same run. A key that fails here isn't re-claimed by
+        this run. `entries` is passed to _render_keys. Returns (done, failed).
+        """
+        leases = LeaseBook(RENDER_LEASES)
+        owner = _worker_id()
+        chunk = max(RENDER_LEASE_CHUNK, TTS_BATCH_SENTENCES if batch else 0)
+        tried = set()
+        done = failed = 0
+
+        def rendered_since(key, since):
+            # Only this worker writes a key's clip while it holds the lease.
+            try:
+                return (self.audio_dir / f"{key}.m4a").stat().st_mtime >= since
+            except FileNotFoundError:
+                return False
+
+        while True:
+            candidates = {k: fp for k, fp in pending.items() if k not in tried}
+            claimed = leases.claim(candidates, chunk, owner)
+            if not claimed:
+                held_until = leases.held_until(candidates, owner)
+                if held_until is None:
+                    break
+                wait = min(RENDER_LEASE_POLL_SECONDS, max(0.0, held_until - time.time()) + 1)
+                print(f"  (other workers hold the remaining keys; checking again in {wait:.0f}s)")
+                time.sleep(wait)
+                continue
+            print(f"\n{owner} claimed {len(claimed)} of {len(candidates)} remaining keys")
+            tried.update(claimed)
+            started = time.time()
+            finished = {}
+            try:
+                chunk_failed = self._render_keys(claimed, workers, encoders, batch, entries)
+                finished = {k: pending[k] for k in claimed if rendered_since(k, started)}
+            finally:
+                leases.release(claimed, owner, done=finished)
+            failed += chunk_failed
+            done += len(claimed) - chunk_failed
+        return done, failed
+
+    def run_pipeline(self, level, words=None, count=None, source="wordlist",
+                     workers=2, encoders=0, concurrency=LLM_CONCURRENCY):
+        """Import or generate entries and render their audio in one overlapping run.
+
+        Entries go onto a bounded priority queue ordered by freq_rank the moment
+        they are saved — source="wordlist" imports Goethe examples, "claude"
+        streams fresh sentences (see generate_for_words) — together with the
+        level's entries still waiting for audio. `workers` threads drain it,
+        most frequent word first, while the producer keeps going; a full queue
+        blocks the producer, so memory stays flat however many words are asked
+        for. With encoders > 0 the AAC encode runs in that many processes.
+        """
+        level, _ = self._level_guidance(level)
+        if level is None:
+            return
+        todo = queue.PriorityQueue(maxsize=PIPELINE_QUEUE_SIZE)
+        seq = iter(range(1 << 62))  # tie-breaker: equal ranks keep arrival order
+        started = time.monotonic()
+        first_clip = None
+        done = failed = 0
+
+        def push(key, entry):
+            todo.put((entry.get("freq_rank", NO_FREQ_RANK), next(seq), key, entry))
+
+        def produce():
+            post_slowed = self._post_slowed()
+            try:
+                # Sorted up front: the queue only orders what fits in it, so an
+                # unsorted backlog larger than the queue would go out roughly
+                # in store order.
+                backlog = sorted(
+                    ((key, entry) for key, entry in self.store.all().items()
+                     if entry.get("level") == level and _needs_audio(entry, post_slowed)),
+                    key=lambda item: item[1].get("freq_rank", NO_FREQ_RANK))
+                for key, entry in backlog:
+                    push(key, entry)
+                if source == "claude":
+                    self.generate_for_words(level, words, count, concurrency=concurrency,
+                                            stream=True, on_entry=push)
+                else:
+                    self.import_wordlist(level, count, on_entry=push)
+            finally:
+                for _ in range(workers):
+                    todo.put((float("inf"), next(seq), None, None))  # sorts after real work
+
+        def render(pool):
+            nonlocal first_clip, done, failed
+            while (item := todo.get())[2] is not None:
+                _, _, key, entry = item
+                try:
+                    if pool is None:
+                        self.create_audio(key, quiet=True, journal=True, entry=entry)
+                    else:
+                        german_audio, english_audio = self._synthesize_pair(entry)
+                        pool.submit(_encode_clip, german_audio, english_audio,
+                                    self.audio_dir / f"{key}.m4a").result()
+                        self._rendered(key, entry)
+                        print(f"✓ Created: {self.audio_dir / f'{key}.m4a'}")
+                except Exception as e:
+                    with self._lock:
+                        failed += 1
+                    print(f"  ✗ {key} failed: {e}")
+                    continue
+                with self._lock:
+                    done += 1
+                    if first_clip is None:
+                        first_clip = time.monotonic() - started
+                        print(f"  First clip ready after {first_clip:.1f}s")
+
+        print(f"Pipeline: {source} -> {workers} audio workers"
+              + (f" + {encoders} encoder processes" if encoders else "") + f" ({level})")
+        pool = None
+        if encoders > 0:
+            from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing
+            pool = ProcessPoolExecutor(max_workers=encoders)
+        producer = threading.Thread(target=produce, daemon=True)
+        try:
+            producer.start()
+            with ThreadPoolExecutor(max_workers=workers) as threads:
+                for _ in range(workers):
+                    threads.submit(render, pool)
+            producer.join()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            self._commit_journal()
+
+        elapsed = time.monotonic() - started
+        print(f"\n✓ Pipeline complete! {done} audio files generated"
+              + (f", {failed} failed" if failed else "") + f" in {elapsed:.1f}s.")
+        print(f"  Clip cache: {self.clip_cache.stats()}")
+
+    def test_voice(self, german_text=None, refresh=False):
         """Synthesize one sample sentence to A/B voices without touching the DB.
 
         Writes voice_test.m4a to the output dir using the currently configured
         GERMAN_VOICE / ENGLISH_VOICE / SPEAKING_RATE / FORCE_POST_SLOWDOWN.
+        With refresh=True, the voices' remembered speaking_rate support is
+        re-probed with fresh API calls (bypassing the clip cache).
         """
         german_text = german_text or "Der schnelle braune Fuchs springt über den faulen Hund."
         english_text = "The quick brown fox jumps over the lazy dog."
@@ -527,22 +2457,30 @@ Return ONLY a JSON array of these objects, one per word, no other text."""
         print(f"German voice : {GERMAN_VOICE}")
         print(f"English voice: {ENGLISH_VOICE}")
         print(f"Speaking rate: {SPEAKING_RATE} (force post-slowdown: {FORCE_POST_SLOWDOWN})")
+        print(f"TTS encoding : {TTS_ENCODING} (slowdown backend: {SLOWDOWN_BACKEND})")
         print(f"DE: {german_text}")
         print(f"EN: {english_text}")
 
-        german_audio = self._synthesize_speech(german_text, "de-DE", GERMAN_VOICE)
-        english_audio = self._synthesize_speech(english_text, "en-US", ENGLISH_VOICE)
+        if refresh:
+            self.voice_caps.forget(GERMAN_VOICE)
+            self.voice_caps.forget(ENGLISH_VOICE)
 
-        german_segment = AudioSegment.from_mp3(io.BytesIO(german_audio))
-        english_segment = AudioSegment.from_mp3(io.BytesIO(english_audio))
-        silence = AudioSegment.silent(duration=1000)  # 1 second
+        german_audio = self._synthesize_speech(german_text, "de-DE", GERMAN_VOICE,
+                                               use_cache=not refresh)
+        english_audio = self._synthesize_speech(english_text, "en-US", ENGLISH_VOICE,
+                                                use_cache=not refresh)
 
-        combined = german_segment + silence + english_segment
+        output_file = _encode_clip(german_audio, english_audio,
+                                   self.audio_dir / "voice_test.m4a")
 
-        output_file = self.audio_dir / "voice_test.m4a"
-        combined.export(output_file, format="ipod", codec="aac", bitrate="128k")
+        for voice in (GERMAN_VOICE, ENGLISH_VOICE):
+            supported = self.voice_caps.supports_rate(voice)
+            if supported is not None:
+                print(f"  {voice}: API speaking_rate "
+                      f"{'supported' if supported else 'rejected (slowed in post)'}")
 
         print(f"✓ Wrote sample: {output_file}")
+        print(f"  Clip cache: {self.clip_cache.stats()}")
         return True
 
     def list_sentences(self, level=None, limit=None):
@@ -551,7 +2489,7 @@ Return ONLY a JSON array of these objects, one per word, no other text."""
         Pass a limit to show only the first N (imported entries are ordered
         most-common-first, so this shows the highest-frequency words).
         """
-        sentences = self._load_sentences()
+        sentences = self.store.all()
 
         if not sentences:
             print("No sentences in database yet.")
@@ -565,13 +2503,17 @@ Return ONLY a JSON array of these objects, one per word, no other text."""
             items = items[:limit]
 
         scope = f", {want}" if want else ""
+        post_slowed = self._post_slowed()
         print(f"\n{'='*80}")
         print(f"SENTENCE DATABASE ({len(items)} shown{scope}, {total_matched} matched, "
               f"{len(sentences)} total)")
         print(f"{'='*80}\n")
 
         for filename, pair in items:
-            status = "✓" if pair.get('audio_generated', False) else "○"
+            if not _needs_audio(pair, post_slowed):
+                status = "✓"
+            else:
+                status = "↻" if pair.get('audio_generated', False) else "○"
             tag = f"[{pair['level']}] " if pair.get('level') else ""
             rank = pair.get('freq_rank')
             rank_msg = f" (freq #{rank})" if rank and rank < NO_FREQ_RANK else ""
@@ -581,11 +2523,16 @@ Return ONLY a JSON array of these objects, one per word, no other text."""
             print()
 
 def main():
+    # Global flag: --no-cache ignores cached TTS clips and Claude replies.
+    use_cache = not _pop_flag(sys.argv, "--no-cache")
     if len(sys.argv) < 2:
         print(__doc__)
         sys.exit(1)
+    if sys.argv[1] in ("-h", "--help", "help"):
+        print(__doc__)
+        sys.exit(0)
     
-    generator = GermanAudioGenerator()
+    generator = GermanAudioGenerator(use_cache=use_cache)
     command = sys.argv[1]
     
     if command == "generate":
@@ -610,19 +2557,75 @@ def main():
         #   generate-words A1 20                     -> top 20 A1 words by frequency
         #   generate-words B1 "Umwelt, sich beeilen" -> these exact words
         #   generate-words A2                        -> top 10 A2 words (default)
-        if len(sys.argv) < 3:
+        #   --concurrency N                          -> N batches in flight (default 4)
+        #   --batch                                  -> one async Message Batch (resumable)
+        #   generate-words --batch                   -> just resume a pending Message Batch
+        #   --stream [--audio]                       -> save (and render) entries as they arrive
+        args = sys.argv[2:]
+        concurrency = int(_pop_option(args, "--concurrency", LLM_CONCURRENCY))
+        batch = _pop_flag(args, "--batch")
+        stream = _pop_flag(args, "--stream")
+        audio = _pop_flag(args, "--audio")
+        if not args and not batch:
             print('Usage: python german_audio.py generate-words <A1|A2|B1> '
-                  '[count | "wort1, wort2, ..."]')
+                  '[count | "wort1, wort2, ..."] [--concurrency N] [--batch | --stream [--audio]]')
             sys.exit(1)
-        level = sys.argv[2]
-        arg = sys.argv[3] if len(sys.argv) > 3 else None
-        if arg is None:
-            generator.generate_for_words(level, count=10)
-        elif arg.isdigit():
-            generator.generate_for_words(level, count=int(arg))
+        level = args[0] if args else None
+        arg = args[1] if len(args) > 1 else None
+        if arg is None or arg.isdigit():
+            target = {"count": int(arg or 10)}
+        else:
+            target = {"words": [w.strip() for w in arg.split(",") if w.strip()]}
+        if batch:
+            generator.generate_for_words_batch(level, **target)
+        elif stream and audio:
+            # Render each entry's audio as soon as it has been saved.
+            renders = {}
+            with ThreadPoolExecutor(max_workers=2) as audio_pool:
+                def render(key, entry):
+                    renders[audio_pool.submit(generator.create_audio, key, quiet=True)] = key
+
+                generator.generate_for_words(level, concurrency=concurrency, stream=True,
+                                             on_entry=render, **target)
+            failed = [(key, f.exception()) for f, key in renders.items() if f.exception()]
+            for key, error in failed:
+                print(f"  ✗ {key} failed: {error}")
+            print(f"✓ Rendered {len(renders) - len(failed)} of {len(renders)} clips"
+                  + (f", {len(failed)} failed" if failed else ""))
         else:
+            generator.generate_for_words(level, concurrency=concurrency,
+                                         stream=stream, **target)
+
+    elif command == "pipeline":
+        # Import/generate and render at once, most frequent words first:
+        #   pipeline A1 200                          -> import top 200 A1 words, voice them
+        #   pipeline B1 50 --source claude           -> fresh Claude sentences instead
+        #   pipeline B1 "Umwelt, Vertrag" --source claude
+        #   --workers N / --encoders N / --concurrency N
+        if len(sys.argv) < 3:
+            print('Usage: python german_audio.py pipeline <A1|A2|B1> [count | "wort1, ..."] '
+                  '[--source wordlist|claude] [--workers N] [--encoders N] [--concurrency N]')
+            sys.exit(1)
+        args = sys.argv[2:]
+        source = _pop_option(args, "--source", "wordlist")
+        workers = int(_pop_option(args, "--workers", 2))
+        encoders = int(_pop_option(args, "--encoders", 0))
+        concurrency = int(_pop_option(args, "--concurrency", LLM_CONCURRENCY))
+        if source not in ("wordlist", "claude"):
+            print(f"✗ Unknown --source '{source}' (use 'wordlist' or 'claude')")
+            sys.exit(1)
+        level = args[0]
+        arg = args[1] if len(args) > 1 else None
+        words, count = None, None
+        if arg is not None and not arg.isdigit():
+            if source != "claude":
+                print("✗ An explicit word list needs --source claude")
+                sys.exit(1)
             words = [w.strip() for w in arg.split(",") if w.strip()]
-            generator.generate_for_words(level, words=words)
+        elif arg is not None:
+            count = int(arg)
+        generator.run_pipeline(level, words, count, source=source, workers=workers,
+                               encoders=encoders, concurrency=concurrency)
 
     elif command == "list":
         level, limit = _parse_level_and_limit(sys.argv[2:])
@@ -636,14 +2639,43 @@ def main():
         generator.create_audio(filename_key)
 
     elif command == "create-all":
-        # Optional level filter: create-all A1
-        level = sys.argv[2] if len(sys.argv) > 2 else None
-        generator.create_all_audio(level)
+        # Optional level filter, synthesis threads and encoder processes:
+        #   create-all A1 --workers 8 --encoders 4
+        args = sys.argv[2:]
+        workers = int(_pop_option(args, "--workers", 1))
+        encoders = int(_pop_option(args, "--encoders", 0))
+        batch = _pop_flag(args, "--batch")
+        # Split the work between machines/processes sharing the data dir:
+        #   --shard 0/3 (1/3, 2/3 elsewhere) -> a fixed third of the keys each
+        #   --lease                          -> claim keys in chunks as you go
+        shard_arg = _pop_option(args, "--shard")
+        shard = None
+        if shard_arg is not None:
+            index, _, count = shard_arg.partition("/")
+            if not (index.isdigit() and count.isdigit() and int(index) < int(count)):
+                print(f"✗ Bad --shard '{shard_arg}' (use i/N with 0 <= i < N)")
+                sys.exit(1)
+            shard = (int(index), int(count))
+        lease = _pop_flag(args, "--lease")
+        level = args[0] if args else None
+        generator.create_all_audio(level, workers=workers, encoders=encoders, batch=batch,
+                                   shard=shard, lease=lease)
+
+    elif command in ("export-db", "import-db"):
+        # Optional snapshot path (defaults to data/sentences.json)
+        path = sys.argv[2] if len(sys.argv) > 2 else None
+        if command == "export-db":
+            generator.export_snapshot(path)
+        else:
+            generator.import_snapshot(path)
 
     elif command == "test-voice":
         # Optional custom German sentence: test-voice "Ich lerne Deutsch."
-        german_text = sys.argv[2] if len(sys.argv) > 2 else None
-        generator.test_voice(german_text)
+        # --refresh re-probes the voices' speaking_rate support.
+        args = sys.argv[2:]
+        refresh = _pop_flag(args, "--refresh")
+        german_text = args[0] if args else None
+        generator.test_voice(german_text, refresh=refresh)
     
     else:
         print(f"Unknown command: {command}")
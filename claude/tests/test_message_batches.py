@@ -0,0 +1,181 @@
+"""generate-words --batch against a fake Message Batches client (no API calls).
+
+Covers submitting, resuming after a crash mid-merge, and that every request's
+result is merged exactly once. Run from the claude/ directory:
+    uv run --with pytest python -m pytest tests
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import german_tts_generator as gtg  # noqa: E402
+
+WORDS = ["Hund", "Katze", "Haus"]
+
+
+def reply(*pairs):
+    """A Claude message whose text is a JSON array of {word, german, english}."""
+    text = json.dumps([{"word": w, "german": de, "english": en} for w, de, en in pairs])
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+
+
+def succeeded(custom_id, message):
+    return SimpleNamespace(custom_id=custom_id,
+                           result=SimpleNamespace(type="succeeded", message=message))
+
+
+def errored(custom_id):
+    return SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type="errored"))
+
+
+class Crash(Exception):
+    """Stands in for the process dying while results are being read."""
+
+
+class FakeBatches:
+    """messages.batches: create/retrieve/results over canned results."""
+
+    def __init__(self, results, polls=1, crash_after=None):
+        self.results_list = results
+        self.polls = polls  # retrieve() calls that report in_progress first
+        self.crash_after = crash_after
+        self.created = []
+
+    def create(self, requests):
+        self.created.append(requests)
+        return SimpleNamespace(id=f"msgbatch_{len(self.created)}")
+
+    def retrieve(self, batch_id):
+        status = "in_progress" if self.polls > 0 else "ended"
+        self.polls -= 1
+        counts = SimpleNamespace(succeeded=len(self.results_list), errored=0, processing=0)
+        return SimpleNamespace(id=batch_id, processing_status=status, request_counts=counts)
+
+    def results(self, batch_id):
+        for n, result in enumerate(self.results_list):
+            if n == self.crash_after:
+                raise Crash()
+            yield result
+
+
+class FakeClient:
+    def __init__(self, batches, direct=None):
+        self.messages = SimpleNamespace(batches=batches, create=self._create)
+        self.direct = direct or []  # replies for synchronous retries, in order
+
+    def _create(self, **request):
+        return self.direct.pop(0)
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """A generator whose data, output and cache dirs all live under tmp_path."""
+    data = tmp_path / "data"
+    monkeypatch.setattr(gtg, "DATA_DIR", data)
+    monkeypatch.setattr(gtg, "AUDIO_DIR", tmp_path / "output")
+    monkeypatch.setattr(gtg, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(gtg, "SENTENCE_STORE", "json")
+    monkeypatch.setattr(gtg, "SENTENCES_FILE", data / "sentences.json")
+    monkeypatch.setattr(gtg, "RENDER_JOURNAL", data / "render_journal.log")
+    monkeypatch.setattr(gtg, "MESSAGE_BATCH_STATE", data / "pending_message_batches.json")
+    monkeypatch.setattr(gtg, "MESSAGE_BATCH_POLL_SECONDS", 0)
+    return gtg.GermanAudioGenerator
+
+
+def make(generator_cls, client):
+    generator = generator_cls()
+    generator._anthropic = client
+    return generator
+
+
+def full_results():
+    return [
+        succeeded("words-0", reply(("Hund", "Der Hund bellt.", "The dog barks."),
+                                   ("Katze", "Die Katze schläft.", "The cat sleeps."))),
+        succeeded("words-1", reply(("Haus", "Das Haus ist alt.", "The house is old."))),
+    ]
+
+
+def test_submit_polls_and_merges(generator):
+    batches = FakeBatches(full_results(), polls=2)
+    gen = make(generator, FakeClient(batches))
+
+    added = gen.generate_for_words_batch("A1", words=WORDS, batch_size=2)
+
+    assert len(batches.created) == 1
+    assert [r["custom_id"] for r in batches.created[0]] == ["words-0", "words-1"]
+    assert sorted(added) == sorted(WORDS)
+    assert gen.store.count() == 3
+    assert gen.store.get("a1_gen_hund")["german"] == "Der Hund bellt."
+    assert not gtg.MESSAGE_BATCH_STATE.exists()
+
+
+def test_crash_then_resume_merges_each_request_once(generator):
+    crashing = FakeBatches(full_results(), crash_after=1)
+    with pytest.raises(Crash):
+        make(generator, FakeClient(crashing)).generate_for_words_batch(
+            "A1", words=WORDS, batch_size=2)
+    state = json.loads(gtg.MESSAGE_BATCH_STATE.read_text(encoding="utf-8"))
+    assert state[0]["merged"] == ["words-0"]
+
+    # A rerun resumes the recorded batch: nothing new is submitted, and words-0
+    # isn't merged again even though its result now reads differently.
+    results = full_results()
+    results[0] = succeeded("words-0", reply(("Hund", "Ein anderer Satz.", "Another one.")))
+    resumed = FakeBatches(results)
+    gen = make(generator, FakeClient(resumed))
+    added = gen.generate_for_words_batch("A1", words=WORDS, batch_size=2)
+
+    assert resumed.created == []
+    assert added == ["Haus"]
+    assert gen.store.count() == 3
+    assert all(e["german"] != "Ein anderer Satz." for e in gen.store.all().values())
+    assert not gtg.MESSAGE_BATCH_STATE.exists()
+
+
+def test_resume_needs_no_level(generator):
+    crashing = FakeBatches(full_results(), crash_after=0)
+    with pytest.raises(Crash):
+        make(generator, FakeClient(crashing)).generate_for_words_batch(
+            "A1", words=WORDS, batch_size=2)
+
+    gen = make(generator, FakeClient(FakeBatches(full_results())))
+    added = gen.generate_for_words_batch()
+
+    assert sorted(added) == sorted(WORDS)
+    assert all(e["level"] == "A1" for e in gen.store.all().values())
+
+
+def test_no_level_and_nothing_pending(generator):
+    batches = FakeBatches(full_results())
+    assert make(generator, FakeClient(batches)).generate_for_words_batch() == []
+    assert batches.created == []
+
+
+def test_errored_request_is_retried_directly(generator):
+    results = [full_results()[0], errored("words-1")]
+    direct = [reply(("Haus", "Das Haus ist neu.", "The house is new."))]
+    gen = make(generator, FakeClient(FakeBatches(results), direct=direct))
+
+    gen.generate_for_words_batch("A1", words=WORDS, batch_size=2)
+
+    assert gen.store.get("a1_gen_haus")["german"] == "Das Haus ist neu."
+
+
+def test_cli_batch_without_level_resumes(generator, monkeypatch):
+    crashing = FakeBatches(full_results(), crash_after=0)
+    with pytest.raises(Crash):
+        make(generator, FakeClient(crashing)).generate_for_words_batch(
+            "A1", words=WORDS, batch_size=2)
+
+    monkeypatch.setattr(gtg.GermanAudioGenerator, "anthropic_client",
+                        FakeClient(FakeBatches(full_results())))
+    monkeypatch.setattr(sys, "argv", ["german_tts_generator.py", "generate-words", "--batch"])
+    gtg.main()
+
+    assert gtg.GermanAudioGenerator().store.count() == 3
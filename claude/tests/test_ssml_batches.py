@@ -0,0 +1,139 @@
+"""create-all --batch's SSML packing and slicing, against FakeTTSClient (no API calls).
+
+Covers _pack_ssml_batches (byte and sentence limits, escaping), the fake
+client's <mark> timepoints, _slice_wav cutting the response back into one
+clip per sentence, and the per-sentence fallback for a rejected request (that
+one needs the Google SDK installed). Run from the claude/ directory:
+    uv run --with pytest python -m pytest tests
+"""
+
+import io
+import re
+import sys
+import wave
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import german_tts_generator as gtg  # noqa: E402
+
+TEXTS = ["Guten Morgen.", "Wie geht's?", "Ich heiße Anna & Tom <3."]
+
+
+def fake_synthesize(ssml, rate=1.0):
+    return gtg.FakeTTSClient().synthesize_speech(
+        input=SimpleNamespace(ssml=ssml),
+        audio_config=SimpleNamespace(speaking_rate=rate))
+
+
+def seconds(wav_bytes):
+    with wave.open(io.BytesIO(wav_bytes)) as w:
+        return w.getnframes() / w.getframerate()
+
+
+def spoken_seconds(text, rate=1.0):
+    return len(text) * gtg.FakeTTSClient.MS_PER_CHAR / rate / 1000
+
+
+def test_pack_escapes_and_marks_each_sentence():
+    [(indices, ssml)] = list(gtg._pack_ssml_batches(TEXTS))
+
+    assert indices == [0, 1, 2]
+    assert ssml.startswith("<speak>") and ssml.endswith("</speak>")
+    assert "Anna &amp; Tom &lt;3." in ssml
+    assert re.findall(r'<mark name="(\w+)"/>', ssml) == ["s0", "e0", "s1", "e1", "s2", "e2"]
+
+
+def test_pack_respects_sentence_limit(monkeypatch):
+    monkeypatch.setattr(gtg, "TTS_BATCH_SENTENCES", 2)
+    texts = [f"Satz {i}." for i in range(5)]
+
+    batches = list(gtg._pack_ssml_batches(texts))
+
+    assert [indices for indices, _ in batches] == [[0, 1], [2, 3], [4]]
+    # Mark numbering restarts in every request.
+    assert all('<mark name="s0"/>' in ssml for _, ssml in batches)
+
+
+def test_pack_respects_byte_limit():
+    texts = ["ä" * 100] * 6  # 200 bytes of text each
+    max_bytes = 700
+
+    batches = list(gtg._pack_ssml_batches(texts, max_bytes=max_bytes))
+
+    assert sorted(i for indices, _ in batches for i in indices) == list(range(6))
+    assert len(batches) > 1
+    assert all(len(ssml.encode("utf-8")) <= max_bytes for _, ssml in batches)
+
+
+def test_oversized_sentence_goes_alone():
+    texts = ["kurz", "x" * 600, "auch kurz"]
+
+    batches = list(gtg._pack_ssml_batches(texts, max_bytes=500))
+
+    assert [indices for indices, _ in batches] == [[0], [1], [2]]
+
+
+def test_fake_client_reports_marks_in_order():
+    [(_, ssml)] = list(gtg._pack_ssml_batches(TEXTS))
+
+    response = fake_synthesize(ssml)
+
+    names = [tp.mark_name for tp in response.timepoints]
+    times = [tp.time_seconds for tp in response.timepoints]
+    assert names == ["s0", "e0", "s1", "e1", "s2", "e2"]
+    assert times == sorted(times)
+    assert times[-1] <= seconds(response.audio_content)
+
+
+@pytest.mark.parametrize("rate", [1.0, 0.85])
+def test_slices_match_each_sentence(rate):
+    [(_, ssml)] = list(gtg._pack_ssml_batches(TEXTS))
+    response = fake_synthesize(ssml, rate)
+    marks = {tp.mark_name: tp.time_seconds for tp in response.timepoints}
+    spans = [(marks[f"s{i}"], marks[f"e{i}"]) for i in range(len(TEXTS))]
+
+    clips = gtg._slice_wav(response.audio_content, spans)
+
+    assert len(clips) == len(TEXTS)
+    for text, clip in zip(TEXTS, clips):
+        spoken = gtg._html_escape(text, quote=False)
+        assert seconds(clip) == pytest.approx(spoken_seconds(spoken, rate), abs=0.002)
+
+
+def test_slice_clamps_spans_to_the_audio():
+    [(_, ssml)] = list(gtg._pack_ssml_batches(["Hallo."]))
+    audio = fake_synthesize(ssml).audio_content
+    total = seconds(audio)
+
+    spans = [(-1.0, 0.1), (total - 0.1, total + 5), (2 * total, 3 * total)]
+
+    clips = gtg._slice_wav(audio, spans)
+
+    assert [round(seconds(c), 3) for c in clips] == [0.1, 0.1, 0.0]
+
+
+def test_rejected_packed_request_falls_back_per_sentence(tmp_path, monkeypatch):
+    google_exceptions = pytest.importorskip("google.api_core.exceptions")
+    pytest.importorskip("google.cloud.texttospeech")
+    monkeypatch.setattr(gtg, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(gtg, "AUDIO_DIR", tmp_path / "output")
+    monkeypatch.setattr(gtg, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(gtg, "SENTENCE_STORE", "json")
+    monkeypatch.setattr(gtg, "SENTENCES_FILE", tmp_path / "data" / "sentences.json")
+    monkeypatch.setattr(gtg, "FAKE_TTS", True)
+    monkeypatch.setattr(gtg, "TTS_ENCODING", "pcm")
+    generator = gtg.GermanAudioGenerator()
+
+    def reject(*args, **kwargs):
+        raise google_exceptions.InvalidArgument("SSML not supported")
+
+    monkeypatch.setattr(generator, "_synthesize_marked", reject)
+
+    clips = generator._synthesize_batch(TEXTS, "de-DE", gtg.GERMAN_VOICE)
+
+    assert len(clips) == len(TEXTS)
+    assert generator.tts_calls == len(TEXTS)
+    assert generator.voice_caps.supports_rate(gtg.GERMAN_VOICE) is not False
@@ -4,35 +4,45 @@ import os
 import re
 import sys
 import json
+import time
+import random
+import runpy
+import sqlite3
+import unicodedata
 
 from rich.markdown import Markdown
 # from rich.console import Console
+from textual import work
 from textual.app import App, ComposeResult
 from textual.widgets import Static
 from textual.containers import Horizontal, Vertical
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from openai import (OpenAI, RateLimitError, APIConnectionError, APITimeoutError,
+                    InternalServerError)
 
 client = OpenAI(
     api_key=os.environ.get("OPENAI_API_KEY"),
 )
 
 
-def get_translation_from_chatgpt(input_text):
+def make_prompt(input_text):
     # The prompt instructs ChatGPT to analyze the German input_text
-    prompt = ("Translate the following German to english "
-              f"or english to German: '{input_text}'.\n"
-              "If a single word is given, provide the singular and plural"
-              "forms and articles. Mention the gender of the articles.\n"
-              "Correct any words and sentence structure, if necessary.\n"
-              "Additionally, tell me if a sentence is Akkusativ, Dativ, etc., and why.\n")
+    return ("Translate the following German to english "
+            f"or english to German: '{input_text}'.\n"
+            "If a single word is given, provide the singular and plural"
+            "forms and articles. Mention the gender of the articles.\n"
+            "Correct any words and sentence structure, if necessary.\n"
+            "Additionally, tell me if a sentence is Akkusativ, Dativ, etc., and why.\n")
+
 
+def get_translation_from_chatgpt(input_text):
     # Send the prompt to ChatGPT
     response = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {
                 "role": "user",
-                "content": prompt,
+                "content": make_prompt(input_text),
             },
         ],
     )
@@ -41,10 +51,374 @@ def get_translation_from_chatgpt(input_text):
     return translation
 
 
-def get_translation_from_json(json_file_path, input_text):
-    with open(json_file_path, 'r') as file:
-        data = json.load(file)
-        return f"{data[input_text]}\n\n[json]"
+def stream_translation_from_chatgpt(input_text):
+    """Like get_translation_from_chatgpt, but yield the answer in pieces as they arrive."""
+    stream = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "user",
+                "content": make_prompt(input_text),
+            },
+        ],
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+# --batch sends up to this many requests at once and retries rate-limit and
+# transient errors this many times, with jittered exponential backoff.
+BATCH_CONCURRENCY = 4
+BATCH_RETRIES = 5
+
+
+def get_translation_with_retries(input_text, retries=BATCH_RETRIES):
+    delay = 1.0
+    for attempt in range(retries + 1):
+        try:
+            return get_translation_from_chatgpt(input_text)
+        except (RateLimitError, APIConnectionError, APITimeoutError,
+                InternalServerError) as e:
+            if attempt == retries:
+                raise
+            wait = delay * (1 + random.random())
+            print(f"{type(e).__name__} for {input_text!r}; retrying in {wait:.1f}s",
+                  file=sys.stderr)
+            time.sleep(wait)
+            delay = min(delay * 2, 60.0)
+
+
+# Same transliteration as pronouns_cli_v2/src/utils.UMLAUT_MAP.
+UMLAUT_MAP = {'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'}
+APOSTROPHES = "'’`´"
+
+
+def normalize_key(text):
+    """Canonical cache key: "Hund", "hund ", "Hund." and "Hund?" all map to "hund".
+
+    Casefolds, transliterates umlauts and ß (so "Mädchen" matches "Maedchen"),
+    drops apostrophes, turns other punctuation except hyphens into spaces and
+    collapses whitespace.
+    """
+    text = unicodedata.normalize("NFC", text).casefold()
+    for umlaut, ascii_form in UMLAUT_MAP.items():
+        text = text.replace(umlaut, ascii_form)
+    if not text.replace(" ", "").replace("-", "").isalnum():
+        chars = []
+        for c in text:
+            if c in APOSTROPHES:
+                continue
+            if c != "-" and unicodedata.category(c).startswith("P"):
+                c = " "
+            chars.append(c)
+        text = "".join(chars)
+    return " ".join(text.split())
+
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+WORDLIST_PATH = os.path.join(REPO_DIR, "claude", "wordlists", "goethe_a1-b1.tsv")
+NOUNS_PATH = os.path.join(REPO_DIR, "chatgpt", "libnouns.py")
+GENDERS = {"der": "masculine", "die": "feminine", "das": "neuter"}
+UMLAUTS = {"a": "ä", "o": "ö", "u": "ü", "A": "Ä", "O": "Ö", "U": "Ü"}
+
+
+def umlaut(word):
+    """Umlaut the stem vowel: Apfel -> Äpfel, Haus -> Häus, Glas -> Gläs."""
+    for i in range(len(word) - 1, -1, -1):
+        if word[i] in UMLAUTS:
+            if word[i] in "uU" and i > 0 and word[i - 1] in "aA":
+                i -= 1  # au -> äu
+            return word[:i] + UMLAUTS[word[i]] + word[i + 1:]
+    return word
+
+
+def parse_headword(headword):
+    """Split a wordlist head word into (article, lemma, plural).
+
+    Handles the list's notations: "die Adresse,-en", "der Apfel, -Ä",
+    "das Glas, -ä, er", "das Haus, -äu, er", "der Arzt, ¨-e", "der Anzug,
+    Anzüge", "der Lehrer, -" and "der Lehrer, –" (plural = singular),
+    "der Stock (sg.)", "die Schokolade (Sg.)", "die Klamotten (pl.)",
+    "abholen(1)". Regional notes ("(A)", "→ D: ...") and a feminine form
+    after "/" are ignored.
+    plural is None when not given or not understood, "" for singular-only nouns.
+    """
+    headword = re.sub(r"\s*\(\d+\)$", "", headword.strip())
+    head, _, marker = headword.partition(",")
+    head = head.strip()
+    # Keep the first alternative and drop notes: "-s (CH) → Fahrrad", "-en/der Hausmann".
+    marker = re.split(r"[(/→]|,\s*-|\s(?:der|die|das)\s", marker)[0].strip()
+    plural = None
+    number = re.search(r"\s*\((sg|pl)\.\)$", head, re.IGNORECASE)
+    if number:
+        head = head[:number.start()]
+        plural = "" if number.group(1).lower() == "sg" else head.partition(" ")[2]
+    article, _, lemma = head.partition(" ")
+    if article not in GENDERS or not lemma:
+        return None, head, plural
+    if marker in ("-", "–"):
+        plural = lemma
+    elif marker.startswith(("-", "¨-")):
+        ending = marker.lstrip("¨-").replace(",", "").replace(" ", "")
+        stem = lemma
+        # "¨-e" umlauts the stem; so does a leading ä/ö/ü (or äu) as in "-ä, er".
+        umlauted = re.match(r"(äu|[äöü])", ending, re.IGNORECASE)
+        if marker.startswith("¨"):
+            stem = umlaut(lemma)
+        elif umlauted:
+            stem, ending = umlaut(lemma), ending[umlauted.end():]
+        elif ending[:1].isupper():
+            stem = ""  # "das Lexikon, -Lexika": the whole plural
+        # The ending repeats the stem's final e's: Adresse, -en -> Adressen; Idee, -een -> Ideen.
+        overlap = 0
+        while ending[overlap:overlap + 1] == "e" and stem.endswith("e" * (overlap + 1)):
+            overlap += 1
+        plural = stem + ending[overlap:]
+    elif marker:
+        plural = marker
+    if plural and not plural.replace("-", "").isalpha():
+        plural = None  # a note we don't understand ("A: Familienstand")
+    return article, lemma, plural
+
+
+def load_lexicon(wordlist_path=WORDLIST_PATH, nouns_path=NOUNS_PATH):
+    """Build {normalized word: [entry, ...]} from the Goethe list and libnouns.
+
+    An entry has article, lemma, plural, level, english (a gloss, from
+    libnouns) and examples [(german, english)]. German head words are indexed
+    with and without their article; libnouns glosses go in a second,
+    English -> German index. Returns (german_index, english_index).
+    """
+    entries = {}
+
+    def entry_for(article, lemma):
+        return entries.setdefault((article, lemma), {
+            "article": article, "lemma": lemma, "plural": None,
+            "level": None, "english": None, "examples": []})
+
+    if os.path.exists(wordlist_path):
+        with open(wordlist_path, encoding="utf-8") as file:
+            next(file, None)  # header
+            for line in file:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) < 4:
+                    continue
+                level, word, german, english = parts[:4]
+                article, lemma, plural = parse_headword(word)
+                entry = entry_for(article, lemma)
+                entry["level"] = entry["level"] or level
+                if plural is not None:
+                    entry["plural"] = plural
+                entry["examples"].append((german, english))
+    if os.path.exists(nouns_path):
+        for category in runpy.run_path(nouns_path)["nouns"].values():
+            for word, english in category.items():
+                article, lemma, plural = parse_headword(word)
+                entry = entry_for(article, lemma)
+                entry["english"] = entry["english"] or english
+                if entry["plural"] is None:
+                    entry["plural"] = plural
+
+    german_index, english_index = {}, {}
+    for entry in entries.values():
+        keys = {normalize_key(entry["lemma"]), normalize_key(entry["lemma"].rstrip("-"))}
+        if entry["article"]:
+            keys.add(normalize_key(f"{entry['article']} {entry['lemma']}"))
+        for key in keys:
+            if key:
+                german_index.setdefault(key, []).append(entry)
+        if entry["english"]:
+            english_index.setdefault(normalize_key(entry["english"]), []).append(entry)
+    return german_index, english_index
+
+
+def get_translation_from_lexicon(input_text, lexicon=None):
+    """Answer a single known word from the local lexicon (Markdown), or None.
+
+    German head words win; an English word is looked up in the glosses only
+    when it isn't a German one. A lowercase input without an article doesn't
+    match a noun ("arm" is not "der Arm"), and a key that is also a head word
+    other than a noun ("essen" next to "das Essen") goes to the LLM: the list
+    has no gloss for it, so the lexicon can't say which one is meant. The
+    lexicon is only loaded for short inputs.
+    """
+    norm_key = normalize_key(input_text)
+    if not norm_key or len(norm_key.split()) > 3:
+        return None  # sentences go to the LLM
+    german_index, english_index = lexicon or load_lexicon()
+    text = input_text.strip()
+    matches = german_index.get(norm_key, [])
+    if text[:1].islower() and text.split()[0].lower() not in GENDERS:
+        matches = [entry for entry in matches
+                   if not (entry["article"] and entry["lemma"][:1].isupper())]
+    if any(not entry["article"] and not entry["english"] for entry in matches):
+        return None
+    lines, examples = [], []
+    if not matches:
+        matches = english_index.get(norm_key)
+        if not matches:
+            return None
+        lines.append(f"English *{text}* in German:\n")
+    for entry in matches:
+        word = f"{entry['article']} {entry['lemma']}" if entry["article"] else entry["lemma"]
+        lines.append(f"**{word}**" + (f" — {entry['english']}" if entry["english"] else ""))
+        if entry["article"]:
+            lines.append(f"- Gender: {GENDERS[entry['article']]} ({entry['article']})")
+            if entry["plural"] == "":
+                lines.append("- Plural: none (singular only)")
+            elif entry["plural"]:
+                lines.append(f"- Plural: die {entry['plural']}")
+        if entry["level"]:
+            lines.append(f"- Level: {entry['level']}")
+        lines.append("")
+        examples += [f"{german}  \n*{english}*" for german, english in entry["examples"]]
+    text = "\n".join(lines).strip()
+    if examples:
+        text += "\n### Examples\n" + "\n\n".join(examples)
+    return text
+
+
+def open_cache(db_file_path, json_file_path=None):
+    """Open the SQLite translation cache, creating it if needed.
+
+    The first time, entries from the old JSON cache (if any) are copied in.
+    WAL mode plus a busy timeout let several translate.py processes read and
+    write the cache at once. Rows keep the input as typed (for display) plus
+    its normalize_key() in an indexed norm_key column.
+    """
+    os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
+    conn = sqlite3.connect(db_file_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.create_function("normalize_key", 1, normalize_key, deterministic=True)
+    with conn:
+        # Take the write lock before reading user_version, so processes opening
+        # the cache at once run each migration exactly once, one after another.
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("CREATE TABLE IF NOT EXISTS translations "
+                     "(input TEXT PRIMARY KEY, translation TEXT NOT NULL)")
+        # user_version records which one-time migrations have run.
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1 and json_file_path and os.path.exists(json_file_path):
+            with open(json_file_path, 'r') as file:
+                data = json.load(file)
+            conn.executemany(
+                "INSERT OR IGNORE INTO translations (input, translation) VALUES (?, ?)",
+                data.items())
+        if version < 2:
+            conn.execute("ALTER TABLE translations ADD COLUMN norm_key TEXT")
+            conn.execute("UPDATE translations SET norm_key = normalize_key(input)")
+            conn.execute("CREATE INDEX IF NOT EXISTS translations_norm_key "
+                         "ON translations (norm_key)")
+            conn.execute("PRAGMA user_version = 2")
+    return conn
+
+
+def get_translation_from_cache(conn, input_text):
+    """Return (translation, cached input) for an exact or normalized hit, else None."""
+    row = conn.execute("SELECT translation FROM translations WHERE input = ?",
+                       (input_text,)).fetchone()
+    if row is not None:
+        return row[0], input_text
+    norm_key = normalize_key(input_text)
+    if not norm_key:
+        return None
+    row = conn.execute("SELECT translation, input FROM translations "
+                       "WHERE norm_key = ? ORDER BY rowid LIMIT 1", (norm_key,)).fetchone()
+    return tuple(row) if row else None
+
+
+def get_offline_translation(conn, input_text, lexicon=None):
+    """Answer without the LLM: (translation, source) or (None, None).
+
+    Known single words come from the lexicon, then the cache is tried.
+    source is "lexicon", "cache" or "cache: <input as originally cached>".
+    """
+    translation = get_translation_from_lexicon(input_text, lexicon)
+    if translation is not None:
+        return translation, "lexicon"
+    hit = get_translation_from_cache(conn, input_text)
+    if hit is None:
+        return None, None
+    translation, cached_input = hit
+    return translation, "cache" if cached_input == input_text else f"cache: {cached_input}"
+
+
+def translate_batch(conn, inputs, concurrency=BATCH_CONCURRENCY):
+    """Translate many inputs; returns [(input, translation, source, error)] in order.
+
+    Duplicates (after normalize_key) are looked up once. Lexicon and cache
+    hits are answered directly; the rest go to the LLM `concurrency` at a time
+    and are written to the cache as they complete.
+    """
+    inputs = list(dict.fromkeys(inputs))
+    lexicon = load_lexicon()
+    answers = {}  # normalized key (or raw input) -> (translation, source, error)
+    misses = {}
+    for input_text in inputs:
+        key = normalize_key(input_text) or input_text
+        if key in answers or key in misses:
+            continue
+        translation, source = get_offline_translation(conn, input_text, lexicon)
+        if translation is None:
+            misses[key] = input_text
+        else:
+            answers[key] = (translation, source, None)
+    print(f"{len(inputs)} inputs: {len(answers)} answered offline, "
+          f"{len(misses)} sent to gpt-4o-mini", file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(get_translation_with_retries, input_text): key
+                   for key, input_text in misses.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                translation = future.result()
+            except Exception as e:
+                answers[key] = (None, None, f"{type(e).__name__}: {e}")
+            else:
+                log_to_cache(conn, misses[key], translation)
+                answers[key] = (translation, "gpt-4o-mini", None)
+            print(f"  {done}/{len(futures)} translated", file=sys.stderr)
+
+    return [(input_text, *answers[normalize_key(input_text) or input_text])
+            for input_text in inputs]
+
+
+def write_batch_results(results, output_format="jsonl", out=sys.stdout):
+    for input_text, translation, source, error in results:
+        if output_format == "md":
+            out.write(f"## {input_text}\n\n")
+            out.write(f"{translation}\n\n*[{source}]*\n\n" if error is None
+                      else f"*failed: {error}*\n\n")
+        else:
+            record = {"input": input_text, "translation": translation, "source": source}
+            if error is not None:
+                record["error"] = error
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def cache_report(conn):
+    """Print how many cached entries key normalization makes redundant.
+
+    Each group of entries sharing a normalized key needed only one API call;
+    the rest would have been cache hits.
+    """
+    total = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    distinct = conn.execute(
+        "SELECT COUNT(DISTINCT norm_key) FROM translations").fetchone()[0]
+    saved = total - distinct
+    rate = f" ({saved / total:.1%})" if total else ""
+    print(f"{total} cached entries, {distinct} distinct after normalization")
+    print(f"{saved} of them{rate} would have been cache hits with normalized keys")
+    groups = conn.execute(
+        "SELECT norm_key, COUNT(*) AS n, GROUP_CONCAT(input, ' | ') FROM translations "
+        "GROUP BY norm_key HAVING n > 1 ORDER BY n DESC, norm_key LIMIT 10").fetchall()
+    if groups:
+        print("\nLargest groups:")
+        for norm_key, n, inputs in groups:
+            print(f"  {n} x {norm_key!r}: {inputs}")
 
 
 def format_response(response):
@@ -66,50 +440,33 @@ def log_raw_markdown(markdown_file_path, input_text, translation):
         log.write(log_text)
 
 
-def is_input_in_json(json_file_path, input_text):
-
-    # Open and load the JSON file
-    if not os.path.exists(json_file_path):
-        with open(json_file_path, 'w+') as file:
-            file.write('{}')
-
-    with open(json_file_path, 'r') as file:
-        data = json.load(file)
-
-    # Check if the input_text exists
-    if input_text in data:
-        return True
-    else:
-        return False
-
-
-def log_to_json(json_file_path, input_text, translation):
+def log_to_cache(conn, input_text, translation):
     try:
-        with open(json_file_path, 'r') as file:
-            data = json.load(file)
-
-        data[input_text] = translation
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations (input, translation, norm_key) "
+                "VALUES (?, ?, ?)",
+                (input_text, translation, normalize_key(input_text)))
+    except sqlite3.Error as e:
+        print(f"An error occurred: {e}", file=sys.stderr)
 
-        with open(json_file_path, 'w+') as file:
-            json.dump(data, file, indent=4)
 
-    except FileNotFoundError:
-        # print(f"The file '{json_file_path}' does not exist.")
-        return
-    except json.JSONDecodeError:
-        # print(f"Error decoding JSON from the file '{json_file_path}'.")
-        return
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return
-
-
-def make_rows(format_response):
+def make_rows(formatted_response):
     for line in formatted_response:
         yield Static(line, classes="box")
 
 
+# While streaming, the answer is re-rendered at most this often (seconds).
+STREAM_REFRESH_INTERVAL = 0.05
+
+
 class VerticalLayoutExample(App):
+    """Shows the input on the left and the answer's ### sections on the right.
+
+    Given a translation, it is shown as is. Otherwise the app starts at once
+    and a worker thread streams the answer from gpt-4o-mini, re-splitting it
+    into sections as text arrives. The finished answer is written to `cache`.
+    """
 
     DEFAULT_CSS = """
 
@@ -138,16 +495,61 @@ class VerticalLayoutExample(App):
 
     """
 
+    def __init__(self, input_text, translation=None, cache=None):
+        super().__init__()
+        self.input_text = input_text
+        self.translation = translation
+        self.cache = cache
+        self.rows = []
+
     def compose(self) -> ComposeResult:
 
         with Horizontal():
 
             with Vertical(classes="left-column"):
-                yield Static(input_text, classes="box")
+                yield Static(self.input_text, classes="box")
+
+            with Vertical(classes="right-column", id="answer"):
+                if self.translation is not None:
+                    yield from make_rows(format_response(self.translation))
 
-            with Vertical(classes="right-column"):
-                for row in make_rows(formatted_response):
-                    yield row
+    def on_mount(self):
+        if self.translation is None:
+            self.show_sections("…")
+            self.stream_answer()
+
+    @work(thread=True, exclusive=True)
+    def stream_answer(self):
+        text = ""
+        shown = time.monotonic()
+        try:
+            for piece in stream_translation_from_chatgpt(self.input_text):
+                text += piece
+                if time.monotonic() - shown >= STREAM_REFRESH_INTERVAL:
+                    self.call_from_thread(self.show_sections, text)
+                    shown = time.monotonic()
+        except Exception as e:
+            self.call_from_thread(self.show_sections,
+                                  f"{text}\n### Error\n{type(e).__name__}: {e}")
+            return
+        self.call_from_thread(self.finish_answer, text)
+
+    def show_sections(self, text):
+        """Render text's ### sections, updating the boxes already on screen."""
+        sections = format_response(text)
+        # Earlier sections are complete once a later ### header has arrived.
+        start = max(len(self.rows) - 1, 0)
+        for row, section in zip(self.rows[start:], sections[start:]):
+            row.update(section)
+        new_rows = [Static(section, classes="box") for section in sections[len(self.rows):]]
+        if new_rows:
+            self.query_one("#answer").mount(*new_rows)
+            self.rows += new_rows
+
+    def finish_answer(self, text):
+        if self.cache is not None:
+            log_to_cache(self.cache, self.input_text, text)
+        self.show_sections(f"{text}\n\n[gpt-4o-mini]")
 
     def on_key(self, event):
         """Handle key presses"""
@@ -159,6 +561,36 @@ if __name__ == "__main__":
 
     markdown_file_path = os.path.expanduser("~/.german/translations.md")
     json_file_path = os.path.expanduser("~/.german/translations.json")
+    db_file_path = os.path.expanduser("~/.german/translations.db")
+
+    if sys.argv[1:] == ["--cache-report"]:
+        cache_report(open_cache(db_file_path, json_file_path))
+        sys.exit(0)
+
+    if sys.argv[1:2] == ["--batch"]:
+        # translate.py --batch [FILE | -] [--concurrency N] [--format jsonl|md]
+        # One input per line (stdin if no FILE); results go to stdout, no TUI.
+        args = sys.argv[2:]
+        concurrency, output_format, path = BATCH_CONCURRENCY, "jsonl", "-"
+        while args:
+            arg = args.pop(0)
+            if arg == "--concurrency" and args:
+                concurrency = int(args.pop(0))
+            elif arg == "--format" and args and args[0] in ("jsonl", "md"):
+                output_format = args.pop(0)
+            elif not arg.startswith("--"):
+                path = arg
+            else:
+                print("Usage: translate.py --batch [FILE | -] [--concurrency N] "
+                      "[--format jsonl|md]", file=sys.stderr)
+                sys.exit(2)
+        file = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with file:
+            inputs = [line.strip() for line in file if line.strip()]
+        results = translate_batch(open_cache(db_file_path, json_file_path), inputs,
+                                  concurrency)
+        write_batch_results(results, output_format)
+        sys.exit(1 if any(error for *_, error in results) else 0)
 
     try:
         sys.argv[1]
@@ -173,14 +605,12 @@ if __name__ == "__main__":
     if not input_text:
         sys.exit()
 
-    if not is_input_in_json(json_file_path, input_text):
-        translation = get_translation_from_chatgpt(input_text)
-        log_to_json(json_file_path, input_text, translation)
-    else:
-        translation = get_translation_from_json(json_file_path, input_text)
-
-    # Format the translation
-    formatted_response = format_response(translation)
+    # Known single words are answered offline; then the cache; then the LLM,
+    # whose answer is streamed into the already running app.
+    cache = open_cache(db_file_path, json_file_path)
+    translation, source = get_offline_translation(cache, input_text)
+    if translation is not None:
+        translation += f"\n\n[{source}]"
 
-    app = VerticalLayoutExample()
+    app = VerticalLayoutExample(input_text, translation, cache)
     app.run()